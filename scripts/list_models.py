@@ -1,36 +1,65 @@
 #!/usr/bin/env python3
 """
 Quick script to list available Gemini models.
-Run: python scripts/list_models.py
+Run: python scripts/list_models.py [--limit N] [--filter SUBSTR]
 """
 
+import argparse
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 import google.generativeai as genai
 
-# Load API key from ~/.devagent/.env
-env_path = Path.home() / ".devagent" / ".env"
-if env_path.exists():
-    load_dotenv(env_path)
 
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    print("❌ GEMINI_API_KEY not found")
-    exit(1)
+def main():
+    parser = argparse.ArgumentParser(description="List available Gemini models")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after N matching models")
+    parser.add_argument("--filter", default=None, help="Only show models whose name contains this substring")
+    args = parser.parse_args()
 
-genai.configure(api_key=api_key)
+    # Load API key from ~/.devagent/.env
+    env_path = Path.home() / ".devagent" / ".env"
+    if env_path.exists():
+        load_dotenv(env_path)
 
-print("📋 Available Gemini Models:\n")
-print("-" * 80)
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("❌ GEMINI_API_KEY not found")
+        exit(1)
+
+    genai.configure(api_key=api_key)
+
+    sys.stdout.write("📋 Available Gemini Models:\n\n" + "-" * 80 + "\n")
+
+    # list_models() pages lazily — iterate and stop early at --limit
+    # instead of draining the whole listing
+    shown = 0
+    for model in genai.list_models():
+        # Only show models that support generateContent
+        if "generateContent" not in model.supported_generation_methods:
+            continue
+        if args.filter and args.filter not in model.name:
+            continue
 
-for model in genai.list_models():
-    # Only show models that support generateContent
-    if "generateContent" in model.supported_generation_methods:
-        print(f"🤖 {model.name}")
-        print(f"   Display Name: {model.display_name}")
         desc = model.description[:100] + "..." if len(model.description) > 100 else model.description
-        print(f"   Description: {desc}")
-        print(f"   Input Token Limit: {model.input_token_limit:,}")
-        print(f"   Output Token Limit: {model.output_token_limit:,}")
-        print("-" * 80)
+        # One buffered write per model instead of six locked prints
+        lines = [
+            f"🤖 {model.name}",
+            f"   Display Name: {model.display_name}",
+            f"   Description: {desc}",
+            f"   Input Token Limit: {model.input_token_limit:,}",
+            f"   Output Token Limit: {model.output_token_limit:,}",
+            "-" * 80,
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
+
+        shown += 1
+        if args.limit and shown >= args.limit:
+            break
+
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
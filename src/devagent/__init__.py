@@ -9,6 +9,13 @@ development tasks based on detailed prompts.
 __version__ = "0.1.0"
 __author__ = "Diego"
 
-from devagent.agent import DevAgent
-
 __all__ = ["DevAgent"]
+
+
+def __getattr__(name):
+    # PEP 562 lazy export: importing devagent stays cheap (no
+    # google.generativeai / rich import) until DevAgent is requested.
+    if name == "DevAgent":
+        from devagent.agent import DevAgent
+        return DevAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,23 +6,400 @@ DevAgent - Main Agent Logic
 Orchestrates the execution of development tasks using Gemini API.
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import random
 import re
+import shlex
 import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
-import google.generativeai as genai
-from rich.console import Console
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
 
+try:
+    import ijson  # incremental JSON parsing for streamed responses
+except ImportError:
+    ijson = None
+
+try:
+    # msgspec compiles a schema-specialized C decoder for the known
+    # response shape: one pass parses and validates, and unknown keys
+    # are skipped without allocating. Optional, like orjson/ijson.
+    import msgspec
+
+    class _EditSpec(msgspec.Struct):
+        search: str = ""
+        replace: str = ""
+
+    class _FileSpec(msgspec.Struct):
+        path: str = ""
+        content: Optional[str] = None
+        description: str = ""
+        edits: list[_EditSpec] = []
+
+    class _ResponseSpec(msgspec.Struct):
+        summary: Optional[str] = None
+        files_to_create: list[_FileSpec] = []
+        files_to_modify: list[_FileSpec] = []
+        files_to_delete: list[str] = []
+        validation_command: Optional[str] = None
+        commit_message: Optional[str] = None
+
+    _response_decoder = msgspec.json.Decoder(_ResponseSpec)
+except ImportError:
+    msgspec = None
+    _response_decoder = None
+
+from devagent.cache import DiskCache
 from devagent.config import Config
 from devagent.context import ProjectContext
 from devagent.knowledge import KnowledgeBase
 from devagent.git_ops import GitOperations
 from devagent.file_ops import FileOperations
 
-console = Console()
+# The Gemini SDK and rich cost hundreds of ms to import; defer both so
+# `import devagent` (and CLI paths that never call the API) stay cheap.
+genai = None
+caching = None
+
+
+def _import_genai():
+    """Import the Gemini SDK on first use."""
+    global genai, caching
+    if genai is None:
+        import google.generativeai as _genai
+        from google.generativeai import caching as _caching
+        genai = _genai
+        caching = _caching
+
+
+_console = None
+
+
+def _get_console():
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+class _LazyConsole:
+    """Proxy that defers rich import / Console construction to first use."""
+
+    def __getattr__(self, name):
+        return getattr(_get_console(), name)
+
+
+console = _LazyConsole()
+
+# Valid JSON escapes (\n, \", \\, \uXXXX, ...) as the first
+# alternative so they're consumed as a unit; group 1 then only
+# captures a genuinely lone backslash — LLMs often emit \x, \p etc.
+# A lookahead alone would misfire on the second backslash of \\.
+_BAD_ESCAPE_RE = re.compile(r'\\[nrtbf"\\/]|\\u[0-9a-fA-F]{4}|(\\)')
+
+
+def _has_bad_escapes(text: str) -> bool:
+    """True if `text` contains a backslash not part of a valid escape."""
+    if '\\' not in text:
+        return False
+    return any(m.group(1) for m in _BAD_ESCAPE_RE.finditer(text))
+
+def _find_json_span(text: str) -> Optional[tuple[int, int]]:
+    """
+    Locate the first balanced JSON object in `text`.
+
+    Single O(n) pass tracking brace/bracket depth and string/escape
+    state — unlike a greedy regex there is no backtracking, so prose
+    wrapped around a large nested payload stays linear. Returns the
+    (start, end) slice indices of the span, or None.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return (start, i + 1)
+
+    return None
+
+# Branch-name slug cleanup
+_BRANCH_CLEAN_RE = re.compile(r'[^a-zA-Z0-9_-]')
+_BRANCH_DASH_RE = re.compile(r'-+')
+
+# Characters that require a shell to interpret a validation command
+# (pipes, redirects, globs, substitutions, quoting...)
+_SHELL_META = frozenset("|&;<>()$`\\\"'*?[#~=%\n")
+
+# Retry policy for transient Gemini API failures
+_MAX_API_ATTEMPTS = 5
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+_RETRYABLE_NAMES = frozenset({
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable",
+    "InternalServerError", "DeadlineExceeded", "Aborted",
+})
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Rate limits and server-side 5xx are worth retrying; nothing else."""
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int) and status in _RETRYABLE_STATUS:
+        return True
+    return type(exc).__name__ in _RETRYABLE_NAMES
+
+
+# Static prompt prefix. Kept as a literal module-level constant so the
+# bytes are identical across every call — provider-side prefix caching
+# (Gemini implicit caching) is byte-exact, so nothing variable may
+# appear before or inside this block.
+_STATIC_HEADER = """# DEVAGENT SYSTEM PROMPT
+
+You are DevAgent, an AI development assistant. You execute development tasks by generating file contents.
+
+# RESPONSE FORMAT
+
+You MUST respond with a valid JSON object. The response will be parsed directly as JSON.
+
+CRITICAL JSON RULES:
+1. All string content must have proper JSON escaping
+2. Use \\n for newlines inside strings
+3. Use \\\\ for backslashes
+4. Use \\" for quotes inside strings
+5. Do NOT include markdown code blocks - respond with raw JSON only
+
+Structure:
+{
+    "summary": "Brief description of what was done",
+    "files_to_create": [
+        {
+            "path": "relative/path/to/file.ts",
+            "content": "file content with proper escaping for newlines (\\n) and quotes (\\")",
+            "description": "why this file was created"
+        }
+    ],
+    "files_to_modify": [
+        {
+            "path": "relative/path/to/existing/file.ts",
+            "edits": [
+                {
+                    "search": "exact existing text to find (must occur exactly once in the file)",
+                    "replace": "replacement text"
+                }
+            ],
+            "description": "what was changed and why"
+        }
+    ],
+    "files_to_delete": ["path/to/delete.ts"],
+    "validation_command": "npm run build",
+    "commit_message": "feat: description of changes"
+}
+
+IMPORTANT:
+- For files_to_modify, emit minimal search/replace edits — do NOT regenerate the whole file
+- Each "search" string must match exactly one location in the current file; include enough surrounding lines to make it unique
+- All paths are relative to the project root
+- Use appropriate commit message prefixes: feat, fix, refactor, docs, chore
+- validation_command should be a command that verifies the changes work
+- Respond ONLY with valid JSON, no explanation before or after"""
+
+# Interned so identity-based fast paths apply when the header feeds
+# cache-key hashing
+_STATIC_HEADER = sys.intern(_STATIC_HEADER)
+
+
+@dataclass(slots=True)
+class FileAction:
+    """A single file operation parsed from the model response."""
+    path: str
+    content: Optional[str] = None
+    description: str = ""
+    edits: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ExecutionResult:
+    """Mutable result of a single task execution."""
+    status: str = "pending"
+    files_created: list = field(default_factory=list)
+    files_modified: list = field(default_factory=list)
+    files_deleted: list = field(default_factory=list)
+    git: dict = field(default_factory=dict)
+    validation: dict = field(default_factory=dict)
+    errors: list = field(default_factory=list)
+    summary: str = ""
+
+
+class _TextResponse:
+    """
+    Minimal stand-in for a Gemini response, wrapping already-
+    materialized text (cache hits, joined streaming chunks).
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _EarlyFileWriter:
+    """
+    Streams `files_to_create` entries to disk while the response is
+    still arriving.
+
+    Raw text chunks are fed into ijson's push parser; each completed
+    object under `files_to_create` is handed to a small thread pool
+    immediately, overlapping network latency with disk writes. Modify
+    and delete actions still wait for the full response — they depend
+    on existing file state.
+
+    If the stream turns out not to be clean JSON (markdown fences,
+    invalid escapes), the parser trips and `finish` reports the early
+    writes as dirty so the normal batch path rewrites them with the
+    repaired content. Inert when ijson is not installed.
+    """
+
+    def __init__(self, file_ops: FileOperations):
+        self.file_ops = file_ops
+        self._futures: list[tuple[str, object]] = []
+        self._failed = ijson is None
+        self._started = False
+        self._pool = None
+        self._coro = None
+        self._result = None
+
+        if ijson is not None:
+            self._pool = ThreadPoolExecutor(max_workers=4)
+            sink = self._dispatch()
+            next(sink)  # prime so items_coro can send into it
+            self._coro = ijson.items_coro(sink, "files_to_create.item")
+
+    def _dispatch(self):
+        while True:
+            obj = (yield)
+            if not isinstance(obj, dict):
+                continue
+            path = obj.get("path")
+            content = obj.get("content")
+            if path and content is not None:
+                # create_file (O_EXCL) so a create aimed at an existing
+                # file raises instead of silently truncating it; the
+                # conflict is surfaced through the batch path in finish
+                self._futures.append(
+                    (path, self._pool.submit(self.file_ops.create_file, path, content))
+                )
+
+    def feed(self, chunk: str):
+        """Feed a raw streamed text chunk into the incremental parser."""
+        if self._failed:
+            return
+
+        if not self._started:
+            # Skip anything before the document itself (leading fence)
+            start = chunk.find("{")
+            if start < 0:
+                return
+            chunk = chunk[start:]
+            self._started = True
+
+        try:
+            self._coro.send(chunk.encode("utf-8"))
+        except Exception:
+            self._failed = True
+
+    def finish(self) -> tuple[set, set]:
+        """
+        Wait for all dispatched writes; returns (clean, dirty) path sets.
+
+        Clean paths already hold the final content and can be skipped by
+        the batch writer; dirty paths may hold stale bytes and must be
+        rewritten. Idempotent.
+        """
+        if self._result is not None:
+            return self._result
+
+        if self._coro is not None:
+            try:
+                self._coro.close()
+            except Exception:
+                self._failed = True
+
+        dispatched = set()
+        for path, future in self._futures:
+            try:
+                future.result()
+            except FileExistsError:
+                # Conflicting create: leave it out of both sets so the
+                # batch path issues a normal create and raises the
+                # same FileExistsError the non-streamed flow would
+                continue
+            except Exception:
+                self._failed = True
+            dispatched.add(path)
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+        if self._failed:
+            self._result = (set(), dispatched)
+        else:
+            self._result = (dispatched, set())
+        return self._result
+
+
+def _read_prompt(path: Path) -> str:
+    """
+    Read a small prompt file with a single open/read/close.
+
+    Skips TextIOWrapper/BufferedReader construction (seek, isatty,
+    buffer allocation) — the file is consumed whole exactly once.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+    return data.decode("utf-8")
+
+
+def _file_action(file_info: dict) -> FileAction:
+    """Build a FileAction record from a raw response dict."""
+    return FileAction(
+        path=file_info["path"],
+        content=file_info.get("content"),
+        description=file_info.get("description", ""),
+        edits=file_info.get("edits") or []
+    )
 
 
 class DevAgent:
@@ -54,15 +431,41 @@ class DevAgent:
         raw_model = model_override or config.default_model
         self.model_name = Config.resolve_model(raw_model)
         
-        self.project_ctx = ProjectContext(Path.cwd())
+        # One getcwd() for the whole agent; collaborators and the
+        # validation subprocess all share it
+        self.cwd = Path.cwd()
+        self.project_ctx = ProjectContext(self.cwd)
         self.knowledge = KnowledgeBase()
-        self.git_ops = GitOperations(Path.cwd()) if use_git else None
-        self.file_ops = FileOperations(Path.cwd())
-        
+        self.git_ops = GitOperations(self.cwd) if use_git else None
+        self.file_ops = FileOperations(self.cwd)
+
+        # Gemini explicit context cache (system prompt prefix)
+        self.cached_content = None
+        self._cached_system_hash = None
+
+        # Local disk cache for full responses (exact prompt match)
+        self.response_cache = DiskCache()
+
+        # Per-instance memoization: in batch runs the project context,
+        # stack rules and persona don't change between prompts
+        self._ctx_cache = None
+        self._rules_cache = {}
+        self._persona_cache = None
+        self._persona_loaded = False
+        self._system_prompt_cache = {}
+        self._rules_block_cache = {}
+
+        # Branch-name suffix; refreshed at the start of each run so a
+        # warm daemon agent doesn't reuse (and silently commit onto)
+        # branches from earlier invocations
+        self._run_timestamp = datetime.now().strftime("%Y%m%d-%H%M")
+
         self._setup_gemini()
     
     def _setup_gemini(self):
         """Configure the Gemini API client."""
+        _import_genai()
+
         if not self.config.gemini_api_key:
             raise ValueError(
                 "Gemini API key not configured. Run 'devagent init' to set it up."
@@ -83,84 +486,233 @@ class DevAgent:
     def execute(self, prompt_path: Path, extra_rules: list[str] = None) -> dict:
         """
         Execute a development task from a prompt file.
-        
+
+        Thin synchronous wrapper around `execute_async`.
+
         Args:
             prompt_path: Path to the prompt markdown file
             extra_rules: Additional rules to include
-            
+
         Returns:
             Result dictionary with status, files changed, etc.
         """
-        result = {
-            "status": "pending",
-            "files_created": [],
-            "files_modified": [],
-            "files_deleted": [],
-            "git": {},
-            "validation": {},
-            "errors": [],
-            "summary": ""
-        }
-        
+        return asyncio.run(self.execute_async(prompt_path, extra_rules))
+
+    async def execute_async(self, prompt_path: Path, extra_rules: list[str] = None) -> dict:
+        """
+        Async implementation of `execute`.
+
+        The Gemini call is awaited so multiple tasks can share an event
+        loop; file operations and git commits remain serialized.
+        """
+        result = self._new_result()
+        early_writer = None
+        self._refresh_run_timestamp()
+
         try:
-            # 1. Read the prompt
-            console.print("[dim]📄 Reading prompt...[/dim]")
-            prompt_content = prompt_path.read_text(encoding="utf-8")
-            
-            # 2. Create git branch if enabled
-            if self.use_git and self.git_ops:
-                branch_name = self._generate_branch_name(prompt_path.stem)
-                console.print(f"[dim]🔀 Creating branch: {branch_name}[/dim]")
-                self.git_ops.create_branch(branch_name)
-                result["git"]["branch"] = branch_name
-            
-            # 3. Build enriched prompt
-            console.print("[dim]🧠 Building context...[/dim]")
-            enriched_prompt = self._build_prompt(prompt_content, extra_rules)
-            
-            # 4. Call Gemini
+            # 1-3. The prelude phases are independent and I/O-bound
+            # (file read, git subprocess, filesystem scans) — overlap
+            # them instead of running serially.
+            console.print("[dim]📄 Reading prompt & building context...[/dim]")
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                f_prompt = pool.submit(_read_prompt, prompt_path)
+                f_bundle = pool.submit(self._build_context_bundle)
+
+                f_branch = None
+                if self.use_git and self.git_ops:
+                    branch_name = self._generate_branch_name(prompt_path.stem)
+                    console.print(f"[dim]🔀 Creating branch: {branch_name}[/dim]")
+                    f_branch = pool.submit(self.git_ops.create_branch, branch_name)
+
+                prompt_content = f_prompt.result()
+                bundle = f_bundle.result()
+                if f_branch is not None:
+                    f_branch.result()
+                    result.git["branch"] = branch_name
+
+            enriched_prompt = self._build_prompt(prompt_content, extra_rules, bundle=bundle)
+
+            # 4. Call Gemini, streaming new files to disk as each one
+            # completes in the response
             console.print("[dim]🤖 Calling Gemini API...[/dim]")
-            response = self._call_gemini(enriched_prompt)
-            
-            # 5. Parse response
-            console.print("[dim]📋 Parsing response...[/dim]")
-            actions = self._parse_response(response)
-            
-            # 6. Execute file operations
-            console.print("[dim]📝 Executing file operations...[/dim]")
-            file_results = self._execute_file_actions(actions)
-            result["files_created"] = file_results["created"]
-            result["files_modified"] = file_results["modified"]
-            result["files_deleted"] = file_results["deleted"]
-            
-            # 7. Run validation if specified
-            if actions.get("validation_command"):
-                console.print("[dim]🧪 Running validation...[/dim]")
-                result["validation"] = self._run_validation(actions["validation_command"])
-            
-            # 8. Git commit if successful
-            if self.use_git and self.git_ops and result["validation"].get("success", True):
-                commit_msg = actions.get("commit_message", f"DevAgent: {prompt_path.stem}")
-                console.print(f"[dim]💾 Committing changes...[/dim]")
-                commit_hash = self.git_ops.commit_all(commit_msg)
-                result["git"]["commit"] = commit_hash
-            
-            # 9. Save to history
-            result["status"] = "success"
-            result["summary"] = actions.get("summary", "Task completed")
-            self.project_ctx.add_history_entry(
-                prompt_name=prompt_path.name,
-                result=result,
-                full_prompt_content=enriched_prompt,
-                full_gemini_response=response.text
+            if ijson is not None:
+                early_writer = _EarlyFileWriter(self.file_ops)
+            response = await self._call_gemini_async(enriched_prompt, early_writer)
+
+            # 5-9. Parse, apply, validate, commit, record
+            await self._finalize_execution(
+                prompt_path, enriched_prompt, response, result, early_writer
             )
-            
+
         except Exception as e:
-            result["status"] = "error"
-            result["errors"].append(str(e))
+            if early_writer is not None:
+                early_writer.finish()  # drain the write pool
+            result.status = "error"
+            result.errors.append(str(e))
             console.print(f"[red]Error: {e}[/red]")
-        
-        return result
+
+        return asdict(result)
+
+    def execute_many(
+        self,
+        prompt_paths: list[Path],
+        extra_rules: list[str] = None,
+        concurrency: int = 4
+    ) -> list[dict]:
+        """
+        Execute several prompt files, firing the Gemini calls concurrently.
+
+        Prompts are built sequentially (cheap), the API calls run under
+        an `asyncio.Semaphore(concurrency)`, and file writes / git
+        commits are applied serially afterwards to preserve ordering.
+
+        Returns one result dictionary per path, in input order.
+        """
+        return asyncio.run(
+            self._execute_many_async(prompt_paths, extra_rules, concurrency)
+        )
+
+    def execute_batch(
+        self,
+        prompt_paths: list[Path],
+        extra_rules: list[str] = None,
+        concurrency: int = 4
+    ) -> list[dict]:
+        """
+        Execute a batch of prompt files (e.g. a whole prompts directory).
+
+        Same as `execute_many`; paths whose enriched prompts are
+        identical share a single Gemini call.
+        """
+        return self.execute_many(prompt_paths, extra_rules, concurrency)
+
+    async def _execute_many_async(
+        self,
+        prompt_paths: list[Path],
+        extra_rules: list[str] = None,
+        concurrency: int = 4
+    ) -> list[dict]:
+        # One suffix for the whole batch: its branches group together
+        # instead of scattering by the minute
+        self._refresh_run_timestamp()
+
+        # Build all enriched prompts up front, coalescing duplicates:
+        # one Gemini call per unique prompt, shared by every path that
+        # produced it (regenerated scaffolds, copied prompt files).
+        jobs = []
+        unique_index: dict[str, int] = {}
+        unique_prompts: list[str] = []
+
+        for prompt_path in prompt_paths:
+            prompt_content = _read_prompt(prompt_path)
+            enriched = self._build_prompt(prompt_content, extra_rules)
+            key = hashlib.sha256(enriched.encode("utf-8")).hexdigest()
+            if key not in unique_index:
+                unique_index[key] = len(unique_prompts)
+                unique_prompts.append(enriched)
+            jobs.append((prompt_path, enriched, unique_index[key]))
+
+        # Fan out the Gemini calls, bounded by a semaphore
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded_call(prompt: str):
+            async with semaphore:
+                return await self._call_gemini_async(prompt)
+
+        console.print(
+            f"[dim]🤖 Calling Gemini API "
+            f"({len(unique_prompts)} unique of {len(jobs)} prompts)...[/dim]"
+        )
+        responses = await asyncio.gather(
+            *[bounded_call(prompt) for prompt in unique_prompts],
+            return_exceptions=True
+        )
+
+        # Apply results serially so branches/commits don't interleave
+        results = []
+        for prompt_path, enriched_prompt, response_idx in jobs:
+            response = responses[response_idx]
+            result = self._new_result()
+
+            if isinstance(response, Exception):
+                result.status = "error"
+                result.errors.append(str(response))
+                console.print(f"[red]Error ({prompt_path.name}): {response}[/red]")
+                results.append(asdict(result))
+                continue
+
+            try:
+                if self.use_git and self.git_ops:
+                    branch_name = self._generate_branch_name(prompt_path.stem)
+                    console.print(f"[dim]🔀 Creating branch: {branch_name}[/dim]")
+                    self.git_ops.create_branch(branch_name)
+                    result.git["branch"] = branch_name
+
+                await self._finalize_execution(prompt_path, enriched_prompt, response, result)
+            except Exception as e:
+                result.status = "error"
+                result.errors.append(str(e))
+                console.print(f"[red]Error ({prompt_path.name}): {e}[/red]")
+
+            results.append(asdict(result))
+
+        return results
+
+    def _new_result(self) -> ExecutionResult:
+        """Fresh result record for a single task execution."""
+        return ExecutionResult()
+
+    async def _finalize_execution(
+        self,
+        prompt_path: Path,
+        enriched_prompt: str,
+        response,
+        result: ExecutionResult,
+        early_writer: _EarlyFileWriter = None
+    ):
+        """Parse the response and apply file ops, validation, commit and history."""
+        # 5. Parse response
+        console.print("[dim]📋 Parsing response...[/dim]")
+        actions = self._parse_response(response)
+
+        # 6. Execute file operations (skipping creates the early writer
+        # already streamed to disk; rewriting any it got wrong)
+        console.print("[dim]📝 Executing file operations...[/dim]")
+        pre_written, dirty = early_writer.finish() if early_writer else (set(), set())
+        file_results = await self._execute_file_actions_async(actions, pre_written, dirty)
+
+        # 7. Launch validation immediately; the bookkeeping below runs
+        # while the validator subprocess is already working
+        val_task = None
+        if actions.get("validation_command"):
+            console.print("[dim]🧪 Running validation...[/dim]")
+            val_task = asyncio.create_task(
+                self._run_validation_async(actions["validation_command"])
+            )
+
+        result.files_created = file_results["created"]
+        result.files_modified = file_results["modified"]
+        result.files_deleted = file_results["deleted"]
+        result.summary = actions.get("summary", "Task completed")
+        commit_msg = actions.get("commit_message", f"DevAgent: {prompt_path.stem}")
+
+        if val_task is not None:
+            result.validation = await val_task
+
+        # 8. Git commit if successful
+        if self.use_git and self.git_ops and result.validation.get("success", True):
+            console.print(f"[dim]💾 Committing changes...[/dim]")
+            commit_hash = self.git_ops.commit_all(commit_msg)
+            result.git["commit"] = commit_hash
+
+        # 9. Save to history
+        result.status = "success"
+        self.project_ctx.add_history_entry(
+            prompt_name=prompt_path.name,
+            result=asdict(result),
+            full_prompt_content=enriched_prompt,
+            full_gemini_response=response.text
+        )
     
     def preview(self, prompt_path: Path, extra_rules: list[str] = None) -> dict:
         """
@@ -168,7 +720,7 @@ class DevAgent:
         
         Returns the parsed actions from Gemini without applying them.
         """
-        prompt_content = prompt_path.read_text(encoding="utf-8")
+        prompt_content = _read_prompt(prompt_path)
         enriched_prompt = self._build_prompt(prompt_content, extra_rules, dry_run=True)
         
         response = self._call_gemini(enriched_prompt)
@@ -181,191 +733,362 @@ class DevAgent:
             "files_to_delete": actions.get("files_to_delete", []),
             "validation_command": actions.get("validation_command"),
             "summary": actions.get("summary", ""),
-            "raw_response": response[:2000] + "..." if len(response) > 2000 else response
+            "raw_response": response.text[:2000] + "..." if len(response.text) > 2000 else response.text
         }
     
+    def _build_context_bundle(self) -> tuple[dict, list[str], Optional[str]]:
+        """
+        Gather project context, stack rules and persona in one place.
+
+        Kept as a separate helper so `execute` can run it on a worker
+        thread, overlapped with the prompt read and branch creation.
+        All three pieces are memoized per agent instance.
+        """
+        ctx = self._cached_context()
+        rules = self._cached_rules(ctx.get("tech_stack", []))
+        persona = self._cached_persona()
+        return ctx, rules, persona
+
+    def _cached_context(self) -> dict:
+        """Project context, detected once per agent instance."""
+        if self._ctx_cache is None:
+            self._ctx_cache = self.project_ctx.get_context()
+        return self._ctx_cache
+
+    def _cached_rules(self, tech_stack: list[str]) -> list[str]:
+        """Stack rules, loaded once per distinct tech stack."""
+        key = tuple(sorted(tech_stack))
+        if key not in self._rules_cache:
+            self._rules_cache[key] = self.knowledge.get_rules_for_stack(tech_stack)
+        return self._rules_cache[key]
+
+    def _cached_persona(self) -> Optional[str]:
+        """Persona content, loaded once (may legitimately be None)."""
+        if not self._persona_loaded:
+            self._persona_cache = self.knowledge.get_persona("diego")
+            self._persona_loaded = True
+        return self._persona_cache
+
+    def invalidate_context(self):
+        """
+        Drop the memoized context, rules and persona.
+
+        Call this after mutating the project filesystem in a way that
+        could change the detected tech stack or applicable rules.
+        """
+        self._ctx_cache = None
+        self._rules_cache.clear()
+        self._persona_cache = None
+        self._persona_loaded = False
+        self._system_prompt_cache.clear()
+        self._rules_block_cache.clear()
+
+        # Also drop the server-side cached-content handle: the resource
+        # expires after 1h, and with the hash memo intact
+        # _ensure_context_cache would keep returning early and never
+        # notice — every generate call would then 403/404. The
+        # prompt_cache.json re-probe reuses the resource if it is in
+        # fact still live, so this costs one GET per invalidation.
+        self.cached_content = None
+        self._cached_system_hash = None
+
     def _build_prompt(
-        self, 
-        user_prompt: str, 
+        self,
+        user_prompt: str,
         extra_rules: list[str] = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        bundle: tuple = None
     ) -> str:
         """Build the complete prompt with context and rules."""
-        
-        # Get project context
-        ctx = self.project_ctx.get_context()
-        
-        # Get relevant rules based on project tech stack
-        rules = self.knowledge.get_rules_for_stack(ctx.get("tech_stack", []))
-        
-        # Add extra rules if specified
+
+        # Get context, rules and persona (precomputed bundle if given)
+        if bundle is None:
+            bundle = self._build_context_bundle()
+        ctx, rules, persona = bundle
+        rules = list(rules)  # don't mutate the shared bundle
+
+        # Add extra rules if specified (sorted so the prompt bytes don't
+        # depend on CLI argument order)
         if extra_rules:
-            for rule_name in extra_rules:
+            for rule_name in sorted(extra_rules):
                 rule_content = self.knowledge.get_rule(rule_name)
                 if rule_content:
                     rules.append(rule_content)
-        
-        # Get persona
-        persona = self.knowledge.get_persona("diego")
-        
-        # Build the system prompt
-        system_prompt = self._build_system_prompt(ctx, rules, persona, dry_run)
-        
-        # Combine everything
-        full_prompt = f"""{system_prompt}
 
----
+        # Build the system prompt (static prefix + deterministic context)
+        system_prompt = self._build_system_prompt(ctx, rules, persona)
+
+        # Try to park the static prefix in Gemini's context cache
+        self._ensure_context_cache(system_prompt)
+
+        # Variable content goes last: mode flag, then the user task.
+        mode = "PREVIEW MODE - Describe what you would do" if dry_run else "EXECUTE MODE - Generate actual file contents"
+        task_prompt = f"""## MODE: {mode}
 
 # USER TASK
 
 {user_prompt}
+"""
 
----
+        if self.cached_content is not None:
+            # The system prefix lives server-side in the context cache
+            return task_prompt
 
-# RESPONSE FORMAT
+        return f"{system_prompt}\n\n---\n\n{task_prompt}"
 
-You MUST respond with a valid JSON object. The response will be parsed directly as JSON.
+    def _ensure_context_cache(self, system_prompt: str):
+        """
+        Register the system prompt as a Gemini cached-content resource.
 
-CRITICAL JSON RULES:
-1. All string content must have proper JSON escaping
-2. Use \\n for newlines inside strings
-3. Use \\\\ for backslashes
-4. Use \\" for quotes inside strings
-5. Do NOT include markdown code blocks - respond with raw JSON only
+        The cache is keyed by a hash of the system prompt, so it is
+        recreated whenever the project context, rules or persona change.
+        Falls back silently to the uncached model if the API rejects the
+        cache (e.g. model doesn't support caching or prefix is too small).
 
-Structure:
-{{
-    "summary": "Brief description of what was done",
-    "files_to_create": [
-        {{
-            "path": "relative/path/to/file.ts",
-            "content": "file content with proper escaping for newlines (\\n) and quotes (\\")",
-            "description": "why this file was created"
-        }}
-    ],
-    "files_to_modify": [
-        {{
-            "path": "relative/path/to/existing/file.ts",
-            "content": "complete new content of the file",
-            "description": "what was changed and why"
-        }}
-    ],
-    "files_to_delete": ["path/to/delete.ts"],
-    "validation_command": "npm run build",
-    "commit_message": "feat: description of changes"
-}}
+        The cache resource name is persisted in the project context dir
+        so subsequent CLI invocations reuse the live resource instead of
+        re-uploading the prefix. Disable via `enable_prompt_cache`.
+        """
+        if not self.config.enable_prompt_cache:
+            return
 
-IMPORTANT:
-- For files_to_modify, provide the COMPLETE new content, not a diff
-- All paths are relative to the project root
-- Use appropriate commit message prefixes: feat, fix, refactor, docs, chore
-- validation_command should be a command that verifies the changes work
-- Respond ONLY with valid JSON, no explanation before or after
-"""
-        
-        return full_prompt
-    
-    def _build_system_prompt(
-        self, 
-        ctx: dict, 
-        rules: list[str], 
-        persona: str,
-        dry_run: bool
-    ) -> str:
-        """Build the system/context portion of the prompt."""
-        
-        mode = "PREVIEW MODE - Describe what you would do" if dry_run else "EXECUTE MODE - Generate actual file contents"
-        
-        prompt = f"""# DEVAGENT SYSTEM PROMPT
+        system_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
 
-You are DevAgent, an AI development assistant. You execute development tasks by generating file contents.
+        if system_hash == self._cached_system_hash:
+            return
 
-## MODE: {mode}
+        self._cached_system_hash = system_hash
+        self.cached_content = None
 
-## PROJECT CONTEXT
+        # Reuse a still-live cache resource from a previous invocation
+        meta_file = self.project_ctx.context_dir / "prompt_cache.json"
+        if meta_file.exists():
+            try:
+                meta = _loads(meta_file.read_bytes())
+                if meta.get("hash") == system_hash:
+                    self.cached_content = caching.CachedContent.get(meta["name"])
+            except Exception:
+                self.cached_content = None  # expired or deleted server-side
 
-- **Name**: {ctx.get('name', 'Unknown')}
-- **Path**: {ctx.get('path', 'Unknown')}
-- **Tech Stack**: {', '.join(ctx.get('tech_stack', ['Unknown']))}
-- **Primary Language**: {ctx.get('primary_language', 'Unknown')}
-- **Framework**: {ctx.get('framework', 'Unknown')}
+        try:
+            if self.cached_content is None:
+                # system_instruction only — also passing the prefix as
+                # `contents` would store and bill it twice and inject
+                # it into the conversation as a user-role message
+                self.cached_content = caching.CachedContent.create(
+                    model=self.model_name,
+                    system_instruction=system_prompt,
+                    ttl=timedelta(hours=1)
+                )
+                meta_file.write_text(json.dumps(
+                    {"name": self.cached_content.name, "hash": system_hash}
+                ))
 
-### Project Structure
-```
-{ctx.get('structure_summary', 'Not available')}
-```
+            self.model = genai.GenerativeModel.from_cached_content(
+                cached_content=self.cached_content,
+                generation_config=self.generation_config
+            )
+            console.print("[dim]💾 System prompt cached (TTL 1h)[/dim]")
+        except Exception as e:
+            # Caching is best-effort; fall back to sending the full prompt
+            self.model = genai.GenerativeModel(
+                self.model_name,
+                generation_config=self.generation_config
+            )
+            console.print(f"[dim]Context caching unavailable: {e}[/dim]")
+    
+    def _build_system_prompt(
+        self,
+        ctx: dict,
+        rules: list[str],
+        persona: str
+    ) -> str:
+        """
+        Build the system/context portion of the prompt.
 
-### Key Files
-{self._format_key_files(ctx.get('key_files', {}))}
+        Output MUST be deterministic for a given project state — it is
+        the cacheable prefix, so static content comes first and every
+        collection is sorted before rendering. Mode and user task are
+        appended separately by `_build_prompt`.
 
-## CODING RULES AND GUIDELINES
+        The rendered string is memoized per input combination — in
+        batch runs and daemon sessions the context rarely changes, so
+        repeat calls skip the string assembly entirely.
+        """
+        cache_key = (
+            ctx.get("_fingerprint") or ctx.get("_cached_at", ""),
+            tuple(rules),
+            persona
+        )
+        cached = self._system_prompt_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-{chr(10).join(rules) if rules else 'No specific rules loaded.'}
+        # The joined rules block is cached separately: rule sets repeat
+        # across context changes, and joining 20+ multi-KB rule files
+        # is the most expensive string op in here
+        rules_key = tuple(rules)
+        rules_block = self._rules_block_cache.get(rules_key)
+        if rules_block is None:
+            rules_block = "\n".join(sorted(rules)) if rules else "No specific rules loaded."
+            self._rules_block_cache[rules_key] = rules_block
 
-## DEVELOPER PREFERENCES
+        # Append-and-join: one final allocation instead of a chain of
+        # intermediate concatenations
+        parts = [
+            _STATIC_HEADER,
+            "\n\n## PROJECT CONTEXT\n\n",
+            "- **Name**: ", str(ctx.get('name', 'Unknown')),
+            "\n- **Path**: ", str(ctx.get('path', 'Unknown')),
+            "\n- **Tech Stack**: ", ", ".join(sorted(ctx.get('tech_stack', ['Unknown']))),
+            "\n- **Primary Language**: ", str(ctx.get('primary_language', 'Unknown')),
+            "\n- **Framework**: ", str(ctx.get('framework', 'Unknown')),
+            "\n\n### Project Structure\n```\n",
+            str(ctx.get('structure_summary', 'Not available')),
+            "\n```\n\n### Key Files\n",
+            self._format_key_files(ctx.get('key_files', {})),
+            "\n\n## CODING RULES AND GUIDELINES\n\n",
+            rules_block,
+            "\n\n## DEVELOPER PREFERENCES\n\n",
+            persona if persona else 'No specific preferences loaded.',
+            "\n",
+        ]
 
-{persona if persona else 'No specific preferences loaded.'}
-"""
+        prompt = "".join(parts)
+        self._system_prompt_cache[cache_key] = prompt
         return prompt
     
     def _format_key_files(self, key_files: dict) -> str:
-        """Format key files for the prompt."""
+        """
+        Format key files for the prompt.
+
+        Iteration MUST be deterministic — the output feeds the prompt
+        hash and Gemini's prefix cache, so dict insertion order (which
+        varies across context detection runs) can't be trusted.
+        """
         if not key_files:
             return "No key files detected."
-        
+
         lines = []
-        for file_type, file_path in key_files.items():
+        for file_type, file_path in sorted(key_files.items()):
             lines.append(f"- **{file_type}**: `{file_path}`")
         return "\n".join(lines)
     
     def _call_gemini(self, prompt: str) -> str:
-        """Call the Gemini API and return the response text."""
-        try:
-            response = self.model.generate_content(prompt)
-            return response
-        except Exception as e:
-            raise RuntimeError(f"Gemini API error: {e}")
+        """Synchronous wrapper around `_call_gemini_async`."""
+        return asyncio.run(self._call_gemini_async(prompt))
+
+    async def _call_gemini_async(self, prompt: str, early_writer: _EarlyFileWriter = None):
+        """
+        Call the Gemini API asynchronously and return the response.
+
+        Identical prompts hit the local disk cache first; cached entries
+        are returned as a lightweight shim exposing the same `.text`.
+        When an `early_writer` is given, each streamed chunk is also fed
+        to it so file creation starts before the response completes.
+        """
+        # Key on model + full effective prompt: when the system prefix
+        # lives server-side in the context cache, `prompt` is only the
+        # task portion, so fold the prefix hash in to keep projects
+        # with identical tasks (and different contexts) distinct — the
+        # sqlite file is shared across all projects and models
+        hasher = hashlib.sha256(self.model_name.encode("utf-8"))
+        hasher.update(b"\x00")
+        if self.cached_content is not None and self._cached_system_hash:
+            hasher.update(self._cached_system_hash.encode("utf-8"))
+        hasher.update(b"\x00")
+        hasher.update(prompt.encode("utf-8"))
+        cache_key = hasher.hexdigest()
+
+        cached_text = self.response_cache.get(cache_key, self.config.response_cache_ttl)
+        if cached_text is not None:
+            console.print("[dim]⚡ Response cache hit[/dim]")
+            return _TextResponse(cached_text)
+
+        # Stream the response so tokens arrive as they are produced
+        # instead of blocking on the full reply. Chunks are echoed only
+        # in debug mode — the payload is raw JSON, not user-readable.
+        # Rate limits and 5xx are retried with exponential backoff and
+        # jitter; anything else propagates immediately.
+        for attempt in range(_MAX_API_ATTEMPTS):
+            try:
+                chunks = []
+                async for chunk in await self.model.generate_content_async(prompt, stream=True):
+                    chunks.append(chunk.text)
+                    if early_writer is not None:
+                        # A retried stream re-feeds from the start; the
+                        # writer's parser trips and marks its files
+                        # dirty, so the batch path rewrites them
+                        early_writer.feed(chunk.text)
+                    if self.config.debug:
+                        console.print(chunk.text, end="")
+                response_text = "".join(chunks)
+                break
+            except Exception as e:
+                if attempt == _MAX_API_ATTEMPTS - 1 or not _is_retryable(e):
+                    raise RuntimeError(f"Gemini API error: {e}")
+                delay = min(2 ** attempt, 30) * (0.5 + random.random())
+                console.print(
+                    f"[yellow]Transient API error ({type(e).__name__}); "
+                    f"retrying in {delay:.1f}s...[/yellow]"
+                )
+                await asyncio.sleep(delay)
+
+        self.response_cache.put(cache_key, response_text)
+        return _TextResponse(response_text)
     
     def _parse_response(self, response: str) -> dict:
         """Parse the JSON response from Gemini."""
-        # Clean up the response
+        # Clean up the response and strip markdown fences
         text = response.text.strip()
-        
-        # Remove markdown code blocks if present
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        
-        if text.endswith("```"):
-            text = text[:-3]
-        
-        text = text.strip()
-        
-        # Try to parse directly
+        if text.startswith("```"):
+            text = text.removeprefix("```json").removeprefix("```")
+        text = text.removesuffix("```").strip()
+
+        # Fastest path: schema-specialized decode + validation in one
+        # pass. Any shape mismatch falls through to the lenient parser.
+        if _response_decoder is not None:
+            try:
+                data = msgspec.to_builtins(_response_decoder.decode(text))
+                # Absent optional keys decode as None; drop them so the
+                # downstream .get(key, default) fallbacks still apply
+                return {k: v for k, v in data.items() if v is not None}
+            except msgspec.DecodeError:
+                pass
+
+        # Fast path: strict parse (orjson when available — C/SIMD parser)
         try:
-            return json.loads(text)
-        except json.JSONDecodeError as e:
+            return _loads(text)
+        except (json.JSONDecodeError, ValueError) as e:
             console.print(f"[yellow]Warning: Initial JSON parse failed, attempting repair...[/yellow]")
-            
+
+            # Cheap C-level scan first: most malformed responses fail
+            # for reasons unrelated to escapes (unterminated string,
+            # trailing comma), so only run the repair when an invalid
+            # escape is actually present.
+            has_bad_escapes = _has_bad_escapes(text)
+
             # Try to fix common escape issues
-            try:
-                # Fix invalid escape sequences by escaping backslashes that aren't part of valid escapes
-                fixed_text = self._fix_json_escapes(text)
-                return json.loads(fixed_text)
-            except json.JSONDecodeError:
-                pass
-            
-            # Try to extract JSON from the response
-            json_match = re.search(r'\{[\s\S]*\}', text)
-            if json_match:
+            if has_bad_escapes:
                 try:
-                    extracted = json_match.group()
-                    fixed_extracted = self._fix_json_escapes(extracted)
-                    return json.loads(fixed_extracted)
-                except json.JSONDecodeError:
+                    # Fix invalid escape sequences by escaping backslashes that aren't part of valid escapes
+                    fixed_text = self._fix_json_escapes(text)
+                    return _loads(fixed_text)
+                except (json.JSONDecodeError, ValueError):
                     pass
-            
+
+            # Try to extract the first balanced JSON object (linear
+            # scan — no regex backtracking over the whole response)
+            span = _find_json_span(text)
+            if span:
+                extracted = text[span[0]:span[1]]
+                if has_bad_escapes:
+                    extracted = self._fix_json_escapes(extracted)
+                try:
+                    return _loads(extracted)
+                except (json.JSONDecodeError, ValueError):
+                    pass
+
             raise ValueError(f"Failed to parse Gemini response as JSON: {e}\nResponse: {text[:500]}")
     
     def _fix_json_escapes(self, text: str) -> str:
@@ -374,100 +1097,233 @@ You are DevAgent, an AI development assistant. You execute development tasks by
         
         LLMs often produce invalid escape sequences like \\x, \\p, etc.
         This method attempts to fix them while preserving valid escapes.
+
+        Single compiled-regex pass; the work happens inside the C regex
+        engine rather than a Python char-by-char loop.
         """
-        # Valid JSON escape sequences
-        valid_escapes = {'\\n', '\\r', '\\t', '\\b', '\\f', '\\"', '\\\\', '\\/'}
-        
-        result = []
-        i = 0
-        while i < len(text):
-            if text[i] == '\\' and i + 1 < len(text):
-                two_char = text[i:i+2]
-                if two_char in valid_escapes:
-                    result.append(two_char)
-                    i += 2
-                elif text[i+1] == 'u' and i + 5 < len(text):
-                    # Unicode escape \uXXXX
-                    result.append(text[i:i+6])
-                    i += 6
-                else:
-                    # Invalid escape - escape the backslash
-                    result.append('\\\\')
-                    i += 1
-            else:
-                result.append(text[i])
-                i += 1
-        
-        return ''.join(result)
+        if '\\' not in text:
+            return text
+
+        # Double only the lone-backslash alternative (group 1); valid
+        # escape pairs matched by the other alternatives pass through
+        return _BAD_ESCAPE_RE.sub(
+            lambda m: r'\\' if m.group(1) else m.group(0), text
+        )
     
-    def _execute_file_actions(self, actions: dict) -> dict:
-        """Execute the file operations from the parsed response."""
-        results = {"created": [], "modified": [], "deleted": []}
-        
-        # Create files
+    async def _execute_file_actions_async(
+        self,
+        actions: dict,
+        pre_written: set = frozenset(),
+        dirty: set = frozenset()
+    ) -> dict:
+        """
+        Execute the file operations from the parsed response.
+
+        The batch is validated up front, then each independent write or
+        delete runs on a worker thread and all are awaited together, so
+        a many-file response overlaps disk latency instead of paying it
+        serially.
+
+        `pre_written` creates were already streamed to disk with final
+        content and are skipped; `dirty` ones may hold stale bytes from
+        a tripped incremental parse and are rewritten in place.
+        """
+        batch = []
+        pre_created = []
+        overwrite_creates = set()
+
         for file_info in actions.get("files_to_create", []):
-            path = file_info["path"]
-            content = file_info["content"]
-            self.file_ops.create_file(path, content)
-            results["created"].append(path)
-            console.print(f"   [green]+ Created: {path}[/green]")
-        
-        # Modify files
+            action = _file_action(file_info)
+            if action.path in pre_written:
+                pre_created.append(action.path)
+                continue
+            if action.path in dirty:
+                overwrite_creates.add(action.path)
+                batch.append((action.path, action.content or "", "modify"))
+                continue
+            batch.append((action.path, action.content or "", "create"))
+
         for file_info in actions.get("files_to_modify", []):
-            path = file_info["path"]
-            content = file_info["content"]
-            self.file_ops.write_file(path, content)
-            results["modified"].append(path)
-            console.print(f"   [yellow]~ Modified: {path}[/yellow]")
-        
-        # Delete files
+            action = _file_action(file_info)
+            batch.append((action.path, self._materialize_edits(action), "modify"))
+
         for path in actions.get("files_to_delete", []):
-            self.file_ops.delete_file(path)
-            results["deleted"].append(path)
-            console.print(f"   [red]- Deleted: {path}[/red]")
-        
+            batch.append((path, "", "delete"))
+
+        prepared = self.file_ops.prepare_batch(batch)
+        outcomes = await asyncio.gather(
+            *(asyncio.to_thread(self.file_ops.apply_action, item) for item in prepared),
+            return_exceptions=True
+        )
+
+        results = {"created": [], "modified": [], "deleted": []}
+        failure = None
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                failure = failure or outcome
+                continue
+            bucket, relative_path = outcome
+            results[bucket].append(relative_path)
+
+        results["created"].extend(pre_created)
+        if overwrite_creates:
+            remaining = []
+            for path in results["modified"]:
+                (results["created"] if path in overwrite_creates else remaining).append(path)
+            results["modified"] = remaining
+
+        # Completion order is nondeterministic; keep the result lists stable
+        for bucket in results.values():
+            bucket.sort()
+
+        if failure is not None:
+            raise failure
+
+        # One render + one write for the whole batch: pre-parse each
+        # line's markup into Text and print a single Group
+        from rich.console import Group
+        from rich.text import Text
+
+        entries = []
+        entries.extend(
+            Text.from_markup(f"   [green]+ Created: {p}[/green]") for p in results["created"]
+        )
+        entries.extend(
+            Text.from_markup(f"   [yellow]~ Modified: {p}[/yellow]") for p in results["modified"]
+        )
+        entries.extend(
+            Text.from_markup(f"   [red]- Deleted: {p}[/red]") for p in results["deleted"]
+        )
+        if entries:
+            console.print(Group(*entries))
+
         return results
-    
+
+    def _materialize_edits(self, action: FileAction) -> str:
+        """
+        Compute the new content for a `files_to_modify` entry.
+
+        Prefers the search/replace edit protocol — the model only emits
+        the delta instead of regenerating the whole file. Falls back to
+        a full `content` field if the model provided one.
+        """
+        if not action.edits:
+            if action.content is not None:
+                return action.content
+            raise ValueError(f"No edits or content for: {action.path}")
+
+        path = action.path
+        current = self.file_ops.read_file(path)
+        if current is None:
+            raise FileNotFoundError(f"Cannot modify missing file: {path}")
+
+        for edit in action.edits:
+            search = edit["search"]
+            occurrences = current.count(search)
+            if occurrences == 0:
+                raise ValueError(f"Edit target not found in {path}: {search[:80]!r}")
+            if occurrences > 1:
+                raise ValueError(
+                    f"Edit target is ambiguous ({occurrences} matches) in {path}: {search[:80]!r}"
+                )
+            current = current.replace(search, edit["replace"], 1)
+
+        return current
+
     def _run_validation(self, command: str) -> dict:
-        """Run a validation command and return the result."""
+        """Synchronous wrapper around `_run_validation_async`."""
+        return asyncio.run(self._run_validation_async(command))
+
+    async def _run_validation_async(self, command: str) -> dict:
+        """
+        Run a validation command, streaming its output to the console.
+
+        Output lines are printed as they arrive instead of buffering
+        the whole log; only the last 1000 lines are retained for the
+        result dict, so a chatty build can't blow up memory.
+
+        Plain commands (`pytest -x`, `tsc --noEmit`) are exec'd
+        directly — no /bin/sh fork in between; the shell is only
+        spawned when the command actually uses shell syntax.
+        """
+        proc = None
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=120,
-                cwd=Path.cwd()
-            )
-            
-            return {
-                "command": command,
-                "success": result.returncode == 0,
-                "output": result.stdout if result.returncode == 0 else result.stderr,
-                "return_code": result.returncode
-            }
-        except subprocess.TimeoutExpired:
+            argv = [] if any(ch in _SHELL_META for ch in command) else shlex.split(command)
+
+            if argv:
+                proc = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    cwd=self.cwd
+                )
+            else:
+                proc = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    cwd=self.cwd
+                )
+
+            tail = deque(maxlen=1000)
+
+            async def pump():
+                async for line in proc.stdout:
+                    decoded = line.decode(errors="replace")
+                    # Raw subprocess output: bracketed text like
+                    # "[/home/user/file]" must not be parsed as markup
+                    console.print(decoded, end="", markup=False, highlight=False)
+                    tail.append(decoded)
+                await proc.wait()
+
+            try:
+                await asyncio.wait_for(pump(), timeout=120)
+            except asyncio.TimeoutError:
+                proc.terminate()
+                try:
+                    await asyncio.wait_for(proc.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                return {
+                    "command": command,
+                    "success": False,
+                    "output": "Command timed out after 120 seconds",
+                    "return_code": -1
+                }
+
             return {
                 "command": command,
-                "success": False,
-                "output": "Command timed out after 120 seconds",
-                "return_code": -1
+                "success": proc.returncode == 0,
+                "output": "".join(tail),
+                "return_code": proc.returncode
             }
         except Exception as e:
+            # Don't leave the subprocess running if the pump itself
+            # failed rather than the command
+            if proc is not None and proc.returncode is None:
+                proc.terminate()
+                try:
+                    await asyncio.wait_for(proc.wait(), timeout=5)
+                except (asyncio.TimeoutError, ProcessLookupError):
+                    proc.kill()
             return {
                 "command": command,
                 "success": False,
                 "output": str(e),
                 "return_code": -1
             }
-    
+
+    def _refresh_run_timestamp(self):
+        """New branch-name suffix for this run (see _generate_branch_name)."""
+        self._run_timestamp = datetime.now().strftime("%Y%m%d-%H%M")
+
     def _generate_branch_name(self, prompt_name: str) -> str:
         """Generate a git branch name from the prompt name."""
         # Clean the prompt name
-        clean_name = re.sub(r'[^a-zA-Z0-9_-]', '-', prompt_name.lower())
-        clean_name = re.sub(r'-+', '-', clean_name).strip('-')
-        
-        # Add timestamp for uniqueness
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M")
-        
-        return f"devagent/{clean_name}-{timestamp}"
+        clean_name = _BRANCH_DASH_RE.sub(
+            '-', _BRANCH_CLEAN_RE.sub('-', prompt_name.lower())
+        ).strip('-')
+
+        # One timestamp per run: every branch in a batch shares the
+        # suffix, while each new run gets its own
+        return f"devagent/{clean_name}-{self._run_timestamp}"
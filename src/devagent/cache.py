@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DevAgent - Response Cache
+
+Disk-backed cache for Gemini responses, keyed by a hash of the full
+enriched prompt. Identical prompts within the TTL short-circuit the
+API round-trip entirely (preview re-runs, repeated dev iterations).
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from devagent.config import GLOBAL_CONFIG_DIR
+
+
+CACHE_DIR = GLOBAL_CONFIG_DIR / "cache"
+CACHE_FILE = CACHE_DIR / "prompts.sqlite"
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value store for prompt responses.
+
+    A single file holds one row per prompt hash; lookups are one
+    SELECT, writes one INSERT OR REPLACE.
+    """
+
+    def __init__(self, cache_file: Path = None):
+        self.cache_file = cache_file or CACHE_FILE
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # The daemon builds the agent on the event-loop thread but runs
+        # preview on a worker thread (asyncio.to_thread), so the
+        # connection must be shareable; the lock serializes access
+        self.conn = sqlite3.connect(str(self.cache_file), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            self.conn.commit()
+
+    def get(self, key: str, max_age: float) -> Optional[str]:
+        """Return the cached text for `key` if newer than `max_age` seconds."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT text, ts FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        text, ts = row
+        if time.time() - ts > max_age:
+            return None
+
+        return text
+
+    def put(self, key: str, text: str):
+        """Store (or refresh) the cached text for `key`."""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, text, ts) VALUES (?, ?, ?)",
+                (key, text, time.time())
+            )
+            self.conn.commit()
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -17,20 +17,16 @@ Usage:
 
 import click
 from pathlib import Path
-from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.table import Table
-import json
 import sys
 
-from devagent.agent import DevAgent
+# rich is imported lazily (via the agent's console proxy and per-command
+# Panel/Table imports) so `devagent --help` doesn't pay for it
+from devagent.agent import DevAgent, console
 from devagent.context import ProjectContext
+from devagent.daemon import request_run
 from devagent.knowledge import KnowledgeBase
 from devagent.config import Config, ensure_global_config
 
-console = Console()
-
 
 @click.group()
 @click.version_option(version="0.1.0", prog_name="devagent")
@@ -62,27 +58,45 @@ def run(prompt_file: str, dry: bool, rules: tuple, no_git: bool, model: str):
         devagent run task.md --dry
         devagent run task.md --rules typescript,nextjs
     """
+    from rich.panel import Panel
+
+    config = None
     try:
         config = Config.load()
-        agent = DevAgent(config, use_git=not no_git, model_override=model)
-        
         prompt_path = Path(prompt_file).resolve()
-        
+        cwd = Path.cwd()
+
         console.print(Panel(
             f"[bold blue]📄 Prompt:[/] {prompt_path.name}\n"
-            f"[bold blue]📁 Project:[/] {Path.cwd().name}\n"
+            f"[bold blue]📁 Project:[/] {cwd.name}\n"
             f"[bold blue]🔧 Mode:[/] {'Dry Run' if dry else 'Execute'}\n"
             f"[bold blue]📚 Extra Rules:[/] {', '.join(rules) if rules else 'None'}",
             title="🤖 DevAgent",
             border_style="blue"
         ))
-        
+
         if dry:
             console.print("\n[yellow]⚠️  DRY RUN - No changes will be made[/yellow]\n")
-            result = agent.preview(prompt_path, extra_rules=list(rules))
-        else:
-            result = agent.execute(prompt_path, extra_rules=list(rules))
-        
+
+        # Prefer the warm daemon (see `devagent daemon`); fall back to
+        # in-process execution when it isn't running
+        result = request_run({
+            "cmd": "run",
+            "prompt": str(prompt_path),
+            "cwd": str(cwd),
+            "rules": list(rules),
+            "dry": dry,
+            "no_git": no_git,
+            "model": model,
+        })
+
+        if result is None:
+            agent = DevAgent(config, use_git=not no_git, model_override=model)
+            if dry:
+                result = agent.preview(prompt_path, extra_rules=list(rules))
+            else:
+                result = agent.execute(prompt_path, extra_rules=list(rules))
+
         _display_result(result)
         
     except FileNotFoundError as e:
@@ -104,9 +118,12 @@ def context(refresh: bool):
     DevAgent automatically detects your project's tech stack,
     structure, and relevant files to provide better assistance.
     """
+    from rich.panel import Panel
+    from rich.table import Table
+
     try:
         project_ctx = ProjectContext(Path.cwd())
-        
+
         if refresh:
             console.print("[yellow]🔄 Refreshing project context...[/yellow]")
             project_ctx.refresh()
@@ -148,6 +165,8 @@ def rules(category: str):
     Rules are markdown files that provide context and guidelines
     for different technologies, patterns, and coding styles.
     """
+    from rich.table import Table
+
     try:
         kb = KnowledgeBase()
         all_rules = kb.list_rules()
@@ -205,15 +224,18 @@ def history(limit: int):
     """
     Show task execution history for the current project.
     """
+    from rich.table import Table
+
     try:
-        project_ctx = ProjectContext(Path.cwd())
+        cwd = Path.cwd()
+        project_ctx = ProjectContext(cwd)
         hist = project_ctx.get_history(limit=limit)
         
         if not hist:
             console.print("[yellow]No history found for this project[/yellow]")
             return
         
-        table = Table(title=f"📜 Task History - {Path.cwd().name}")
+        table = Table(title=f"📜 Task History - {cwd.name}")
         table.add_column("Date", style="cyan")
         table.add_column("Prompt", style="white")
         table.add_column("Status", style="green")
@@ -235,9 +257,30 @@ def history(limit: int):
         sys.exit(1)
 
 
+@main.command()
+def daemon():
+    """
+    Run the DevAgent background daemon.
+
+    Keeps the Gemini SDK, HTTP connection pool and per-project context
+    warm behind a Unix socket. While the daemon is running,
+    `devagent run` forwards to it automatically and skips process startup.
+    """
+    from devagent.daemon import SOCKET_PATH, run_daemon
+
+    console.print(f"[dim]🔌 Listening on {SOCKET_PATH} (Ctrl+C to stop)[/dim]")
+    try:
+        run_daemon()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Daemon stopped[/yellow]")
+
+
 @main.command()
 def status():
     """Display current configuration status."""
+    from rich.panel import Panel
+    from rich.table import Table
+
     try:
         config = Config.load()
         
@@ -260,58 +303,62 @@ def status():
 
 
 def _display_result(result: dict):
-    """Display the execution result in a nice format."""
-    
+    """
+    Display the execution result in a nice format.
+
+    The whole report is accumulated and rendered with a single
+    `console.print` — one ANSI render and one write syscall instead of
+    one per file, which matters for multi-hundred-file results.
+    """
     status = result.get("status", "unknown")
-    
+
     if status == "success":
-        console.print("\n[bold green]✅ Task completed successfully![/bold green]\n")
+        lines = ["\n[bold green]✅ Task completed successfully![/bold green]\n"]
     elif status == "partial":
-        console.print("\n[bold yellow]⚠️  Task completed with warnings[/bold yellow]\n")
+        lines = ["\n[bold yellow]⚠️  Task completed with warnings[/bold yellow]\n"]
     else:
-        console.print("\n[bold red]❌ Task failed[/bold red]\n")
-    
+        lines = ["\n[bold red]❌ Task failed[/bold red]\n"]
+
     # Files created
     if result.get("files_created"):
-        console.print("[bold]📄 Files Created:[/bold]")
-        for f in result["files_created"]:
-            console.print(f"   [green]+ {f}[/green]")
-    
+        lines.append("[bold]📄 Files Created:[/bold]")
+        lines.extend(f"   [green]+ {f}[/green]" for f in result["files_created"])
+
     # Files modified
     if result.get("files_modified"):
-        console.print("[bold]📝 Files Modified:[/bold]")
-        for f in result["files_modified"]:
-            console.print(f"   [yellow]~ {f}[/yellow]")
-    
+        lines.append("[bold]📝 Files Modified:[/bold]")
+        lines.extend(f"   [yellow]~ {f}[/yellow]" for f in result["files_modified"])
+
     # Git info
     if result.get("git"):
         git_info = result["git"]
-        console.print(f"\n[bold]🔀 Git:[/bold]")
+        lines.append("\n[bold]🔀 Git:[/bold]")
         if git_info.get("branch"):
-            console.print(f"   Branch: [cyan]{git_info['branch']}[/cyan]")
+            lines.append(f"   Branch: [cyan]{git_info['branch']}[/cyan]")
         if git_info.get("commit"):
-            console.print(f"   Commit: [cyan]{git_info['commit'][:8]}[/cyan]")
-    
+            lines.append(f"   Commit: [cyan]{git_info['commit'][:8]}[/cyan]")
+
     # Validation
     if result.get("validation"):
         val = result["validation"]
         val_status = "✅" if val.get("success") else "❌"
-        console.print(f"\n[bold]🧪 Validation:[/bold] {val_status}")
+        lines.append(f"\n[bold]🧪 Validation:[/bold] {val_status}")
         if val.get("command"):
-            console.print(f"   Command: [dim]{val['command']}[/dim]")
+            lines.append(f"   Command: [dim]{val['command']}[/dim]")
         if val.get("output") and not val.get("success"):
-            console.print(f"   [red]{val['output'][:500]}[/red]")
-    
+            lines.append(f"   [red]{val['output'][:500]}[/red]")
+
     # Summary
     if result.get("summary"):
-        console.print(f"\n[bold]📋 Summary:[/bold]")
-        console.print(f"   {result['summary']}")
-    
+        lines.append(f"\n[bold]📋 Summary:[/bold]")
+        lines.append(f"   {result['summary']}")
+
     # Errors
     if result.get("errors"):
-        console.print(f"\n[bold red]Errors:[/bold red]")
-        for err in result["errors"]:
-            console.print(f"   [red]• {err}[/red]")
+        lines.append(f"\n[bold red]Errors:[/bold red]")
+        lines.extend(f"   [red]• {err}[/red]" for err in result["errors"])
+
+    console.print("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -7,17 +7,71 @@ Handles global configuration including API keys and defaults.
 Configuration is stored in ~/.devagent/
 """
 
+import json
 import os
-import yaml
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional
 
 
 GLOBAL_CONFIG_DIR = Path.home() / ".devagent"
-GLOBAL_CONFIG_FILE = GLOBAL_CONFIG_DIR / "config.yaml"
+GLOBAL_CONFIG_FILE = GLOBAL_CONFIG_DIR / "config.json"
 GLOBAL_ENV_FILE = GLOBAL_CONFIG_DIR / ".env"
 
+# Pre-JSON installs stored the config here; migrated on first load
+GLOBAL_LEGACY_CONFIG_FILE = GLOBAL_CONFIG_DIR / "config.yaml"
+
+
+def _migrate_legacy_config():
+    """
+    One-shot migration of the old config.yaml to config.json.
+
+    The config is five scalar keys read on every invocation; stdlib
+    json parses it without the yaml import (or its pure-Python parser
+    when libyaml is absent). yaml is only touched here, and only when
+    a legacy file actually exists.
+    """
+    if GLOBAL_CONFIG_FILE.exists() or not GLOBAL_LEGACY_CONFIG_FILE.exists():
+        return
+
+    try:
+        import yaml
+        try:
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+
+        with open(GLOBAL_LEGACY_CONFIG_FILE, "r") as f:
+            data = yaml.load(f, Loader=loader) or {}
+
+        if isinstance(data, dict):
+            _atomic_write_bytes(
+                GLOBAL_CONFIG_FILE,
+                json.dumps(data, indent=2).encode("utf-8") + b"\n",
+                mode=0o644
+            )
+            GLOBAL_LEGACY_CONFIG_FILE.unlink()
+    except Exception:
+        pass  # unreadable legacy config (or no yaml); fall back to defaults
+
+
+def _atomic_write_bytes(path: Path, data: bytes, mode: int = 0o600):
+    """
+    Write a small file in one shot: open with the final mode, single
+    os.write, then rename into place.
+
+    The mode is set at create time, so no follow-up chmod is needed,
+    and the os.replace means readers never observe a partial file.
+    """
+    tmp = str(path) + ".tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
 
 # Available models mapped by use case
 AVAILABLE_MODELS = {
@@ -39,54 +93,58 @@ DEFAULT_MODEL = "models/gemini-2.5-flash"
 class Config:
     """DevAgent configuration."""
     
-    gemini_api_key: Optional[str] = None
     default_model: str = DEFAULT_MODEL
     debug: bool = False
     auto_commit: bool = True
     create_branch: bool = True
     default_validation: Optional[str] = None
+    response_cache_ttl: int = 3600  # seconds; local response cache freshness
+    enable_prompt_cache: bool = True  # Gemini explicit context caching
     
     # Paths
     config_dir: Path = field(default_factory=lambda: GLOBAL_CONFIG_DIR)
     projects_dir: Path = field(default_factory=lambda: GLOBAL_CONFIG_DIR / "projects")
     logs_dir: Path = field(default_factory=lambda: GLOBAL_CONFIG_DIR / "logs")
-    
+
+    # Lazily-resolved API key; repr=False keeps it out of debug output
+    _api_key: Optional[str] = field(default=None, repr=False)
+    _api_key_loaded: bool = field(default=False, repr=False)
+
+    @property
+    def gemini_api_key(self) -> Optional[str]:
+        """
+        The Gemini API key, resolved on first access.
+
+        Checked in order: GEMINI_API_KEY environment variable, then the
+        global .env file. Commands that never call the API (rules,
+        history, context) skip the .env read entirely.
+        """
+        if not self._api_key_loaded:
+            self._api_key = _read_api_key()
+            self._api_key_loaded = True
+        return self._api_key
+
+    @gemini_api_key.setter
+    def gemini_api_key(self, value: Optional[str]):
+        self._api_key = value
+        self._api_key_loaded = True
+
     @classmethod
     def load(cls) -> "Config":
-        """Load configuration from global config file and environment."""
-        config = cls()
-        
-        # Load from config file if exists
-        if GLOBAL_CONFIG_FILE.exists():
-            try:
-                with open(GLOBAL_CONFIG_FILE, "r") as f:
-                    data = yaml.safe_load(f) or {}
-                
-                config.default_model = data.get("default_model", config.default_model)
-                config.debug = data.get("debug", config.debug)
-                config.auto_commit = data.get("auto_commit", config.auto_commit)
-                config.create_branch = data.get("create_branch", config.create_branch)
-                config.default_validation = data.get("default_validation")
-                
-            except Exception:
-                pass  # Use defaults if config file is invalid
-        
-        # Load API key from environment or .env file
-        config.gemini_api_key = os.environ.get("GEMINI_API_KEY")
-        
-        if not config.gemini_api_key and GLOBAL_ENV_FILE.exists():
-            try:
-                with open(GLOBAL_ENV_FILE, "r") as f:
-                    for line in f:
-                        line = line.strip()
-                        if line.startswith("GEMINI_API_KEY="):
-                            config.gemini_api_key = line.split("=", 1)[1].strip().strip('"\'')
-                            break
-            except Exception:
-                pass
-        
-        return config
-    
+        """
+        Load configuration from the global config file.
+
+        Cached per process: every command calls this, often more than
+        once, and the underlying file never changes mid-run except
+        through save()/set_api_key() — which call invalidate().
+        """
+        return _load_config()
+
+    @staticmethod
+    def invalidate():
+        """Drop the cached Config so the next load() re-reads disk."""
+        _load_config.cache_clear()
+
     @staticmethod
     def resolve_model(model_name: str) -> str:
         """
@@ -117,26 +175,81 @@ class Config:
             "debug": self.debug,
             "auto_commit": self.auto_commit,
             "create_branch": self.create_branch,
+            "response_cache_ttl": self.response_cache_ttl,
+            "enable_prompt_cache": self.enable_prompt_cache,
         }
         
         if self.default_validation:
             data["default_validation"] = self.default_validation
         
-        with open(GLOBAL_CONFIG_FILE, "w") as f:
-            yaml.dump(data, f, default_flow_style=False)
-    
+        _atomic_write_bytes(
+            GLOBAL_CONFIG_FILE,
+            json.dumps(data, indent=2).encode("utf-8") + b"\n",
+            mode=0o644
+        )
+
+        self.invalidate()
+
     def set_api_key(self, api_key: str):
         """Save API key to the global .env file."""
         ensure_global_config()
-        
+
         self.gemini_api_key = api_key
-        
-        # Write to .env file
-        with open(GLOBAL_ENV_FILE, "w") as f:
-            f.write(f'GEMINI_API_KEY="{api_key}"\n')
-        
-        # Set restrictive permissions
-        GLOBAL_ENV_FILE.chmod(0o600)
+
+        # Created 0600 directly — no window where the key is readable
+        _atomic_write_bytes(GLOBAL_ENV_FILE, f'GEMINI_API_KEY="{api_key}"\n'.encode("utf-8"))
+
+        self.invalidate()
+
+
+@lru_cache(maxsize=1)
+def _load_config() -> Config:
+    """Read the global config file once per process (see Config.load)."""
+    config = Config()
+
+    _migrate_legacy_config()
+
+    # Load from config file if exists
+    if GLOBAL_CONFIG_FILE.exists():
+        try:
+            data = json.loads(GLOBAL_CONFIG_FILE.read_bytes()) or {}
+
+            config.default_model = data.get("default_model", config.default_model)
+            config.debug = data.get("debug", config.debug)
+            config.auto_commit = data.get("auto_commit", config.auto_commit)
+            config.create_branch = data.get("create_branch", config.create_branch)
+            config.default_validation = data.get("default_validation")
+            config.response_cache_ttl = data.get("response_cache_ttl", config.response_cache_ttl)
+            config.enable_prompt_cache = data.get("enable_prompt_cache", config.enable_prompt_cache)
+
+        except Exception:
+            pass  # Use defaults if config file is invalid
+
+    return config
+
+
+def _read_api_key() -> Optional[str]:
+    """
+    Resolve the API key from the environment or the global .env file.
+
+    The file is tiny and fixed-format: one read syscall, then a
+    bytes-level scan — no TextIOWrapper or per-line decoding.
+    """
+    api_key = os.environ.get("GEMINI_API_KEY")
+
+    if not api_key and GLOBAL_ENV_FILE.exists():
+        try:
+            for line in GLOBAL_ENV_FILE.read_bytes().split(b"\n"):
+                line = line.strip()
+                if line.startswith(b"GEMINI_API_KEY="):
+                    api_key = (
+                        line[len(b"GEMINI_API_KEY="):].strip().strip(b'"\'').decode()
+                    )
+                    break
+        except Exception:
+            pass
+
+    return api_key
 
 
 def ensure_global_config() -> Path:
@@ -158,19 +271,21 @@ def ensure_global_config() -> Path:
             "debug": False,
             "auto_commit": True,
             "create_branch": True,
+            # JSON has no comments, so ship the shortcut reference as data
+            "_model_shortcuts": AVAILABLE_MODELS,
         }
-        
-        with open(GLOBAL_CONFIG_FILE, "w") as f:
-            yaml.dump(default_config, f, default_flow_style=False)
-            f.write("\n# Model shortcuts available:\n")
-            for shortcut, full_name in AVAILABLE_MODELS.items():
-                f.write(f"# - {shortcut}: {full_name}\n")
-    
+
+        _atomic_write_bytes(
+            GLOBAL_CONFIG_FILE,
+            json.dumps(default_config, indent=2).encode("utf-8") + b"\n",
+            mode=0o644
+        )
+
     # Create .env template if it doesn't exist
     if not GLOBAL_ENV_FILE.exists():
-        with open(GLOBAL_ENV_FILE, "w") as f:
-            f.write('# DevAgent Environment Variables\n')
-            f.write('GEMINI_API_KEY="your-api-key-here"\n')
-        GLOBAL_ENV_FILE.chmod(0o600)
+        _atomic_write_bytes(
+            GLOBAL_ENV_FILE,
+            b'# DevAgent Environment Variables\nGEMINI_API_KEY="your-api-key-here"\n'
+        )
     
     return GLOBAL_CONFIG_DIR
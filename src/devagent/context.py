@@ -12,37 +12,128 @@ Handles detection and caching of project context including:
 
 import json
 import hashlib
+import os
 from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from datetime import datetime
 from typing import Optional
 import uuid
 
 from devagent.config import GLOBAL_CONFIG_DIR
+from devagent.file_ops import _resolve
+
+try:
+    from xxhash import xxh64
+
+    def _hash_path(path: str) -> str:
+        """Short non-cryptographic hash of a path for directory naming."""
+        return format(xxh64(path.encode()).intdigest(), "016x")[:12]
+except ImportError:
+    def _hash_path(path: str) -> str:
+        """Short non-cryptographic hash of a path for directory naming."""
+        # blake2s beats md5 on short inputs and digest_size=6 gives the
+        # 12 hex chars directly, no slicing of a full digest
+        return hashlib.blake2s(path.encode(), digest_size=6).hexdigest()
+
+
+# History compaction: once the log tops this many lines, rewrite it
+# keeping only the most recent entries
+_HISTORY_COMPACT_AT = 500
+_HISTORY_KEEP = 100
+
+# Backstop for the fingerprint check: the fingerprint only sees
+# top-level entries, but the structure summary renders to depth 2, so
+# deeper additions/removals would otherwise never trigger a rescan
+_CONTEXT_MAX_AGE = 3600  # seconds
 
 
 class ProjectContext:
     """
     Manages context for a specific project.
-    
+
     Context is cached in ~/.devagent/projects/{project_hash}/
     """
-    
+
     def __init__(self, project_path: Path):
-        self.project_path = project_path.resolve()
+        # Shared memoized resolve — FileOperations canonicalizes the
+        # same root, so the component walk happens once per process
+        self.project_path = _resolve(str(project_path))
         self.project_name = self.project_path.name
-        self.project_hash = self._hash_path(str(self.project_path))
-        
+        self.project_hash = _hash_path(str(self.project_path))
+
         self.context_dir = GLOBAL_CONFIG_DIR / "projects" / self.project_hash
         self.context_file = self.context_dir / "context.json"
-        self.history_file = self.context_dir / "history.json"
-        
+        self.history_file = self.context_dir / "history.ndjson"
+
+        self._migrate_legacy_context_dir()
+
         # Ensure directory exists
         self.context_dir.mkdir(parents=True, exist_ok=True)
-    
-    def _hash_path(self, path: str) -> str:
-        """Create a short hash of the project path for directory naming."""
-        return hashlib.md5(path.encode()).hexdigest()[:12]
-    
+
+        self._migrate_legacy_history()
+
+    def _migrate_legacy_context_dir(self):
+        """
+        One-shot rename of the MD5-named project directory that older
+        versions used, so cached context and history carry over.
+        """
+        if self.context_dir.exists():
+            return
+
+        legacy = (GLOBAL_CONFIG_DIR / "projects" /
+                  hashlib.md5(str(self.project_path).encode()).hexdigest()[:12])
+        if legacy.exists():
+            try:
+                self.context_dir.parent.mkdir(parents=True, exist_ok=True)
+                legacy.rename(self.context_dir)
+            except OSError:
+                pass  # fall through; a fresh directory is created below
+
+    def _migrate_legacy_history(self):
+        """One-shot conversion of the old history.json array to NDJSON."""
+        legacy = self.context_dir / "history.json"
+        if not legacy.exists() or self.history_file.exists():
+            return
+
+        try:
+            entries = json.loads(legacy.read_bytes())
+            with open(self.history_file, "wb") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry).encode("utf-8") + b"\n")
+            legacy.unlink()
+        except Exception:
+            pass  # unreadable legacy history; start fresh
+
+    def _fingerprint(self) -> str:
+        """
+        Cheap hash of the project's shape: the names, mtimes and sizes
+        of the top-level entries. Everything the detected context is
+        derived from (config files, directory layout) lives at the top
+        level, so the cached context stays valid exactly as long as
+        this hash does — no tree walk needed to check.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(str(self.project_path).encode())
+
+        try:
+            with os.scandir(self.project_path) as it:
+                entries = sorted(
+                    (e.name, e.stat(follow_symlinks=False).st_mtime_ns,
+                     e.stat(follow_symlinks=False).st_size)
+                    for e in it
+                )
+        except OSError:
+            return ""
+
+        for name, mtime_ns, size in entries:
+            h.update(f"{name}:{mtime_ns}:{size};".encode())
+
+        return h.hexdigest()
+
     def _get_task_history_dir(self, task_id: str) -> Path:
         """
         Returns the path to the task-specific history directory, creating it if it doesn't exist.
@@ -55,16 +146,19 @@ class ProjectContext:
         """
         Get the project context, loading from cache or detecting fresh.
         """
-        # Try to load cached context
+        # Try to load cached context: valid as long as the project's
+        # top-level fingerprint hasn't changed (no tree walk needed)
         if self.context_file.exists():
             try:
-                with open(self.context_file, "r") as f:
-                    cached = json.load(f)
-                
-                # Check if cache is still valid (less than 1 hour old)
-                cached_time = datetime.fromisoformat(cached.get("_cached_at", "2000-01-01"))
-                if (datetime.now() - cached_time).seconds < 3600:
-                    return cached
+                loads = orjson.loads if orjson is not None else json.loads
+                cached = loads(self.context_file.read_bytes())
+
+                if cached.get("_fingerprint") and cached["_fingerprint"] == self._fingerprint():
+                    age = (
+                        datetime.now() - datetime.fromisoformat(cached["_cached_at"])
+                    ).total_seconds()
+                    if 0 <= age < _CONTEXT_MAX_AGE:
+                        return cached
             except Exception:
                 pass
         
@@ -81,7 +175,8 @@ class ProjectContext:
             "framework": None,
             "key_files": {},
             "structure_summary": "",
-            "_cached_at": datetime.now().isoformat()
+            "_cached_at": datetime.now().isoformat(),
+            "_fingerprint": self._fingerprint()
         }
         
         # Detect tech stack based on files present
@@ -94,18 +189,30 @@ class ProjectContext:
         # Generate structure summary
         context["structure_summary"] = self._generate_structure_summary()
         
-        # Cache the context
-        with open(self.context_file, "w") as f:
-            json.dump(context, f, indent=2)
-        
+        # Cache the context; orjson serializes in C straight to bytes,
+        # and write_bytes skips the text-mode encode
+        if orjson is not None:
+            self.context_file.write_bytes(orjson.dumps(context, option=orjson.OPT_INDENT_2))
+        else:
+            self.context_file.write_bytes(json.dumps(context, indent=2).encode("utf-8"))
+
         return context
     
     def _detect_tech_stack(self) -> tuple[list[str], dict]:
         """Detect technologies used in the project."""
         tech_stack = []
         key_files = {}
-        
-        # Check for various config files
+
+        # One scandir pass instead of a stat per candidate file: every
+        # detector except prisma probes a top-level name, so membership
+        # in this set answers all of them
+        try:
+            with os.scandir(self.project_path) as it:
+                names = {e.name for e in it}
+        except OSError:
+            names = set()
+
+        # Check for various config files (all top-level)
         detectors = {
             # JavaScript/TypeScript ecosystem
             "package.json": ("nodejs", "package.json"),
@@ -117,39 +224,47 @@ class ProjectContext:
             "vite.config.js": ("vite", "vite.config.js"),
             "tailwind.config.js": ("tailwind", "tailwind.config.js"),
             "tailwind.config.ts": ("tailwind", "tailwind.config.ts"),
-            
+
             # Python ecosystem
             "requirements.txt": ("python", "requirements.txt"),
             "pyproject.toml": ("python", "pyproject.toml"),
             "setup.py": ("python", "setup.py"),
             "Pipfile": ("python", "Pipfile"),
-            
-            # Database
-            "prisma/schema.prisma": ("prisma", "prisma/schema.prisma"),
-            
+
             # Docker
             "Dockerfile": ("docker", "Dockerfile"),
             "docker-compose.yml": ("docker", "docker-compose.yml"),
             "docker-compose.yaml": ("docker", "docker-compose.yaml"),
-            
+
             # Git
             ".git": ("git", None),
         }
-        
+
         for file_path, (tech, key_file_name) in detectors.items():
-            if (self.project_path / file_path).exists():
+            if file_path in names:
                 if tech not in tech_stack:
                     tech_stack.append(tech)
                 if key_file_name:
                     key_files[tech] = file_path
+
+        # Nested paths need their own stat; gate on the parent dir
+        # being in the scandir set so the common miss costs nothing
+        if "prisma" in names:
+            try:
+                os.stat(os.path.join(self.project_path, "prisma", "schema.prisma"))
+            except OSError:
+                pass
+            else:
+                tech_stack.append("prisma")
+                key_files["prisma"] = "prisma/schema.prisma"
         
         # Additional detection from package.json
         package_json = self.project_path / "package.json"
         if package_json.exists():
             try:
-                with open(package_json, "r") as f:
-                    pkg = json.load(f)
-                
+                loads = orjson.loads if orjson is not None else json.loads
+                pkg = loads(package_json.read_bytes())
+
                 deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
                 
                 if "react" in deps:
@@ -186,56 +301,85 @@ class ProjectContext:
                 return fw.title() if fw != "nextjs" else "Next.js"
         return None
     
-    def _generate_structure_summary(self, max_depth: int = 2) -> str:
+    def _generate_structure_summary(self, max_depth: int = 2, max_lines: int = 50) -> str:
         """Generate a summary of the project structure."""
         lines = []
-        
-        def walk(path: Path, prefix: str = "", depth: int = 0):
+        truncated = False
+
+        # Skip certain directories
+        skip_dirs = {".git", "node_modules", "__pycache__", ".next", "venv", ".venv", "dist", "build"}
+        keep_hidden = {".env.example", ".gitignore"}
+
+        def walk(path: str, prefix: str = "", depth: int = 0):
+            nonlocal truncated
             if depth > max_depth:
                 return
-            
-            # Skip certain directories
-            skip_dirs = {".git", "node_modules", "__pycache__", ".next", "venv", ".venv", "dist", "build"}
-            
+
+            # scandir over iterdir: one readdir, cached d_type answers
+            # is_dir without a stat, and no Path allocation per entry
             try:
-                items = sorted(path.iterdir(), key=lambda x: (x.is_file(), x.name))
-            except PermissionError:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda e: (not e.is_dir(follow_symlinks=False), e.name))
+            except OSError:
                 return
-            
-            for i, item in enumerate(items):
-                if item.name.startswith(".") and item.name not in [".env.example", ".gitignore"]:
+
+            for i, entry in enumerate(entries):
+                if entry.name.startswith(".") and entry.name not in keep_hidden:
                     continue
-                if item.name in skip_dirs:
+                if entry.name in skip_dirs:
                     continue
-                
-                is_last = i == len(items) - 1
+
+                if len(lines) >= max_lines:
+                    truncated = True
+                    return
+
+                is_last = i == len(entries) - 1
                 current_prefix = "└── " if is_last else "├── "
-                lines.append(f"{prefix}{current_prefix}{item.name}")
-                
-                if item.is_dir():
+                lines.append(f"{prefix}{current_prefix}{entry.name}")
+
+                if entry.is_dir(follow_symlinks=False):
                     extension = "    " if is_last else "│   "
-                    walk(item, prefix + extension, depth + 1)
-        
-        walk(self.project_path)
-        
-        # Limit output
-        if len(lines) > 50:
-            lines = lines[:50]
+                    walk(entry.path, prefix + extension, depth + 1)
+
+        walk(str(self.project_path))
+
+        if truncated:
             lines.append("... (truncated)")
-        
+
         return "\n".join(lines)
     
     def get_history(self, limit: int = 10) -> list[dict]:
         """Get recent task history for this project."""
         if not self.history_file.exists():
             return []
-        
+
+        loads = orjson.loads if orjson is not None else json.loads
         try:
-            with open(self.history_file, "r") as f:
-                history = json.load(f)
-            return history[-limit:]
+            return [loads(line) for line in self._tail_lines(self.history_file, limit)]
         except Exception:
             return []
+
+    @staticmethod
+    def _tail_lines(path: Path, count: int) -> list[bytes]:
+        """
+        Read the last `count` non-empty lines of a file.
+
+        Seeks backwards in blocks from the end, so `history --limit 10`
+        doesn't parse a long-lived project's entire log.
+        """
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+
+            while pos > 0 and data.count(b"\n") <= count:
+                step = min(8192, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+
+        lines = [line for line in data.split(b"\n") if line]
+        return lines[-count:]
     
     def add_history_entry(
         self, 
@@ -245,8 +389,6 @@ class ProjectContext:
         full_gemini_response: str
     ):
         """Add an entry to the task history, including full prompt and Gemini response."""
-        history = self.get_history(limit=100)  # Keep last 100
-        
         task_id = str(uuid.uuid4())
         task_history_dir = self._get_task_history_dir(task_id)
 
@@ -270,7 +412,39 @@ class ProjectContext:
             "git_commit": result.get("git", {}).get("commit"),
         }
         
-        history.append(entry)
-        
-        with open(self.history_file, "w") as f:
-            json.dump(history, f, indent=2)
+        # Single atomic O_APPEND write — no read-modify-write of the
+        # whole log, and a Ctrl-C can at worst lose this one line
+        line = (orjson.dumps(entry) if orjson is not None
+                else json.dumps(entry).encode("utf-8")) + b"\n"
+
+        fd = os.open(self.history_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+        # Size check is a free fstat on the fd we already hold; the
+        # line count (and possible rewrite) only runs once the log is
+        # plausibly past the threshold
+        if size > 64 * 1024:
+            self._compact_history()
+
+    def _compact_history(self):
+        """Rewrite the history log keeping the last _HISTORY_KEEP lines."""
+        try:
+            data = self.history_file.read_bytes()
+        except OSError:
+            return
+
+        if data.count(b"\n") <= _HISTORY_COMPACT_AT:
+            return
+
+        lines = [line for line in data.split(b"\n") if line][-_HISTORY_KEEP:]
+
+        # Written to the side and renamed in, so a concurrent
+        # get_history never sees a half-written log
+        tmp = str(self.history_file) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"\n".join(lines) + b"\n")
+        os.replace(tmp, self.history_file)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DevAgent - Background Daemon
+
+Keeps a warm process behind a Unix socket: the imported Gemini SDK, its
+HTTPS connection pool and per-project DevAgent instances (context,
+knowledge base, model handle) all survive between CLI invocations, so
+`devagent run` skips interpreter + SDK startup when the daemon is up.
+
+Protocol: one JSON request per connection, newline-terminated, answered
+by one JSON reply — {"result": {...}} or {"error": "..."}.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import struct
+from pathlib import Path
+from typing import Optional
+
+from devagent.config import GLOBAL_CONFIG_DIR
+
+
+SOCKET_PATH = GLOBAL_CONFIG_DIR / "sock"
+
+# Warm agents kept per (project, git-mode, model); oldest evicted first
+_MAX_AGENTS = 8
+
+
+class DevAgentDaemon:
+    """Unix-socket server holding warm DevAgent instances per project."""
+
+    def __init__(self, socket_path: Path = None):
+        self.socket_path = socket_path or SOCKET_PATH
+        self._agents = {}  # (cwd, use_git, model) -> DevAgent, LRU order
+        self._lock = asyncio.Lock()
+
+    def _get_agent(self, cwd: str, use_git: bool, model: Optional[str]):
+        """Fetch (or build) the warm agent for a project, LRU-style."""
+        from devagent.agent import DevAgent
+        from devagent.config import Config
+
+        key = (cwd, use_git, model)
+        agent = self._agents.pop(key, None)
+
+        if agent is None:
+            agent = DevAgent(Config.load(), use_git=use_git, model_override=model)
+            if len(self._agents) >= _MAX_AGENTS:
+                self._agents.pop(next(iter(self._agents)))
+        else:
+            # A previous run may have written files; drop the memoized
+            # context/system-prompt so this run re-detects the project
+            agent.invalidate_context()
+
+        self._agents[key] = agent
+        return agent
+
+    @staticmethod
+    def _peer_authorized(writer) -> bool:
+        """Only accept connections from our own UID (SO_PEERCRED)."""
+        sock = writer.get_extra_info("socket")
+        if sock is None or not hasattr(socket, "SO_PEERCRED"):
+            # Non-Linux: the 0600 socket file mode is the guard
+            return True
+
+        try:
+            creds = sock.getsockopt(
+                socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+            )
+            _pid, uid, _gid = struct.unpack("3i", creds)
+            return uid == os.getuid()
+        except OSError:
+            return False
+
+    async def _handle(self, reader, writer):
+        try:
+            if not self._peer_authorized(writer):
+                return
+
+            request = json.loads(await reader.readline())
+
+            # Serialize runs: agents chdir into their project and git
+            # operations must not interleave
+            async with self._lock:
+                os.chdir(request["cwd"])
+                agent = self._get_agent(
+                    request["cwd"],
+                    not request.get("no_git", False),
+                    request.get("model")
+                )
+
+                prompt_path = Path(request["prompt"])
+                rules = request.get("rules") or []
+
+                if request.get("dry"):
+                    # preview is sync (drives its own event loop)
+                    result = await asyncio.to_thread(
+                        agent.preview, prompt_path, rules
+                    )
+                else:
+                    result = await agent.execute_async(prompt_path, rules)
+
+            reply = {"result": result}
+        except Exception as e:
+            reply = {"error": str(e)}
+
+        try:
+            writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Bind the socket and serve until cancelled."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        server = await asyncio.start_unix_server(
+            self._handle, path=str(self.socket_path)
+        )
+        os.chmod(self.socket_path, 0o600)
+
+        async with server:
+            await server.serve_forever()
+
+
+def run_daemon(socket_path: Path = None):
+    """Run the daemon in the foreground (blocks)."""
+    asyncio.run(DevAgentDaemon(socket_path).serve())
+
+
+def request_run(payload: dict, socket_path: Path = None, timeout: float = 600.0) -> Optional[dict]:
+    """
+    Forward a run request to the daemon.
+
+    Returns the result dict, or None when no daemon is reachable so the
+    caller can fall back to in-process execution. Daemon-side errors are
+    re-raised as RuntimeError.
+    """
+    path = socket_path or SOCKET_PATH
+    if not path.exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+
+            buf = b""
+            while not buf.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buf += chunk
+    except OSError:
+        return None  # stale socket / daemon gone
+
+    if not buf:
+        return None
+
+    reply = json.loads(buf)
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return reply.get("result")
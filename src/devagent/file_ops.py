@@ -10,9 +10,28 @@ Handles file system operations including:
 - Reading files
 """
 
+import mmap
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+# Above this size read_file maps the file instead of read()ing it;
+# below it the mmap setup costs more than it saves
+_MMAP_THRESHOLD = 256 * 1024
+
+
+@lru_cache(maxsize=32)
+def _resolve(path: str) -> Path:
+    """
+    Canonicalize a path once per process.
+
+    resolve() stats every component; ProjectContext and FileOperations
+    are typically both built for the same project root, so sharing this
+    cache (also used from context.py) does that walk once.
+    """
+    return Path(path).resolve()
+
 
 class FileOperations:
     """
@@ -22,28 +41,54 @@ class FileOperations:
     """
     
     def __init__(self, project_path: Path):
-        self.project_path = project_path.resolve()
-    
+        self.project_path = _resolve(str(project_path))
+
+        # Parent directories already ensured this process — lets
+        # repeat writes into the same directory skip the mkdir stat
+        self._known_dirs: set[Path] = set()
+
+    def _ensure_parent(self, path: Path):
+        """Create the parent directory once per process."""
+        parent = path.parent
+        if parent not in self._known_dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._known_dirs.add(parent)
+
     def _resolve_path(self, relative_path: str) -> Path:
         """Resolve a relative path to an absolute path within the project."""
         # Clean up the path
         relative_path = relative_path.strip().lstrip("/")
-        
+
         full_path = (self.project_path / relative_path).resolve()
-        
-        # Security check: ensure we're still within the project
-        if not str(full_path).startswith(str(self.project_path)):
+
+        # Security check: ensure we're still within the project.
+        # is_relative_to compares path components, so a sibling like
+        # /project-backup no longer passes as it did with the old
+        # string-prefix check
+        if not full_path.is_relative_to(self.project_path):
             raise ValueError(f"Path escapes project directory: {relative_path}")
-        
+
         return full_path
     
     def read_file(self, relative_path: str) -> Optional[str]:
         """Read a file's contents."""
         try:
             path = self._resolve_path(relative_path)
-            if path.exists():
-                return path.read_text(encoding="utf-8")
-            return None
+            if not path.exists():
+                return None
+
+            if os.path.getsize(path) > _MMAP_THRESHOLD:
+                # Large files: map instead of read, letting the kernel
+                # page data straight into place; madvise prefaults it
+                # ahead of the sequential decode where supported
+                with open(path, "rb") as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                        mm.madvise(mmap.MADV_WILLNEED)
+                    return mm[:].decode("utf-8")
+
+            return path.read_bytes().decode("utf-8")
         except Exception:
             return None
     
@@ -55,16 +100,20 @@ class FileOperations:
         Raises error if file already exists.
         """
         path = self._resolve_path(relative_path)
-        
-        if path.exists():
+        self._ensure_parent(path)
+
+        # O_EXCL makes the existence check and the create one atomic
+        # syscall — no separate stat, and no race between the two
+        try:
+            fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
             raise FileExistsError(f"File already exists: {relative_path}")
-        
-        # Create parent directories
-        path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write file
-        path.write_text(content, encoding="utf-8")
-        
+
+        try:
+            os.write(fd, content.encode("utf-8"))
+        finally:
+            os.close(fd)
+
         return True
     
     def write_file(self, relative_path: str, content: str) -> bool:
@@ -74,15 +123,89 @@ class FileOperations:
         Creates parent directories if needed.
         """
         path = self._resolve_path(relative_path)
-        
-        # Create parent directories
-        path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write file
-        path.write_text(content, encoding="utf-8")
-        
+        self._ensure_parent(path)
+
+        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content.encode("utf-8"))
+        finally:
+            os.close(fd)
+
         return True
     
+    def write_batch(self, items: list[tuple[str, str, str]]) -> dict:
+        """
+        Apply a batch of file actions in one pass.
+
+        Each item is (relative_path, content, action) where action is
+        'create', 'modify' or 'delete'. Paths are resolved and checked
+        up front, needed directories are created once per parent, and
+        writes go through raw os.open/os.write — no per-file BufferedIO
+        construction. Items are processed grouped by parent directory.
+
+        Returns {"created": [...], "modified": [...], "deleted": [...]}.
+        """
+        results = {"created": [], "modified": [], "deleted": []}
+
+        for item in self.prepare_batch(items):
+            bucket, relative_path = self.apply_action(item)
+            results[bucket].append(relative_path)
+
+        return results
+
+    def prepare_batch(self, items: list[tuple[str, str, str]]) -> list[tuple]:
+        """
+        Resolve and validate a batch of file actions before touching disk.
+
+        Raises on the first invalid item, creates every needed parent
+        directory once, and returns the prepared items for
+        `apply_action`. Prepared items are independent of each other, so
+        callers may apply them in any order or concurrently.
+        """
+        resolved = []
+        for relative_path, content, action in items:
+            path = self._resolve_path(relative_path)
+            if action == "create" and path.exists():
+                raise FileExistsError(f"File already exists: {relative_path}")
+            resolved.append((relative_path, path, content, action))
+
+        # Group by parent directory (dcache locality) and pre-create
+        # all needed directories in a single pass
+        resolved.sort(key=lambda item: str(item[1].parent))
+
+        seen_dirs = set()
+        for _, path, _, action in resolved:
+            if action != "delete" and path.parent not in seen_dirs:
+                os.makedirs(path.parent, exist_ok=True)
+                seen_dirs.add(path.parent)
+
+        return resolved
+
+    def apply_action(self, item: tuple) -> tuple[str, str]:
+        """
+        Apply one prepared item from `prepare_batch`.
+
+        Writes go through raw os.open/os.write — no per-file BufferedIO
+        construction. Returns (bucket, relative_path) where bucket is
+        'created', 'modified' or 'deleted'.
+        """
+        relative_path, path, content, action = item
+
+        if action == "delete":
+            if path.is_dir():
+                raise IsADirectoryError(f"Cannot delete directory: {relative_path}")
+            if path.exists():
+                path.unlink()
+            return ("deleted", relative_path)
+
+        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, content.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+        return ("created" if action == "create" else "modified", relative_path)
+
     def delete_file(self, relative_path: str) -> bool:
         """Delete a file."""
         path = self._resolve_path(relative_path)
@@ -9,19 +9,44 @@ Handles git operations including:
 - Generating commit messages
 """
 
+import re
 import subprocess
 from pathlib import Path
 from typing import Optional
 
+# First line of default `git commit` output, e.g.
+# "[main abc1234] message" or "[main (root-commit) abc1234] message"
+_COMMIT_LINE_RE = re.compile(r"^\[.+? ([0-9a-f]{7,40})\]")
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 
 class GitOperations:
     """
     Manages git operations for a project.
+
+    Uses a long-lived libgit2 repository handle (pygit2) for the hot
+    paths — no fork+exec of the git binary per operation — and falls
+    back to git subprocesses when pygit2 is unavailable.
     """
-    
+
     def __init__(self, project_path: Path):
         self.project_path = project_path
         self._verify_git_repo()
+
+        # Branch name cached per instance; it only changes through
+        # create_branch/checkout_branch, which update it
+        self._branch_cache: Optional[str] = None
+
+        self._repo = None
+        if pygit2 is not None:
+            try:
+                self._repo = pygit2.Repository(str(project_path))
+            except Exception:
+                self._repo = None
     
     def _verify_git_repo(self):
         """Verify that we're in a git repository."""
@@ -41,15 +66,60 @@ class GitOperations:
         except Exception as e:
             return False, str(e)
     
+    def _git_status(self) -> tuple[str, bool]:
+        """
+        One `git status --porcelain -b` answering both the current
+        branch (the `## ` header line) and whether the tree is dirty
+        (any line after it) — one fork+exec instead of two.
+        """
+        success, output = self._run_git("status", "--porcelain", "-b")
+        if not success:
+            return "unknown", False
+
+        lines = output.split("\n")
+        header = lines[0][3:] if lines[0].startswith("## ") else ""
+
+        if not header or header.startswith("HEAD"):
+            branch = "unknown"  # detached HEAD
+        elif header.startswith("No commits yet on "):
+            branch = header[len("No commits yet on "):]
+        else:
+            branch = header.split("...", 1)[0]
+
+        return branch, len(lines) > 1
+
+    def _branch_pygit2(self) -> str:
+        """Current branch via libgit2 — an in-process ref lookup."""
+        target = self._repo.lookup_reference("HEAD").target
+        # Symbolic target (a str) covers normal and unborn branches;
+        # an Oid target means detached HEAD
+        if isinstance(target, str) and target.startswith("refs/heads/"):
+            return target[len("refs/heads/"):]
+        return "unknown"
+
     def get_current_branch(self) -> str:
         """Get the name of the current branch."""
-        success, output = self._run_git("branch", "--show-current")
-        return output if success else "unknown"
-    
+        if self._branch_cache is None:
+            if self._repo is not None:
+                try:
+                    self._branch_cache = self._branch_pygit2()
+                    return self._branch_cache
+                except Exception:
+                    pass  # fall through to the subprocess path
+            self._branch_cache, _ = self._git_status()
+        return self._branch_cache
+
     def has_uncommitted_changes(self) -> bool:
         """Check if there are uncommitted changes."""
-        success, output = self._run_git("status", "--porcelain")
-        return bool(output)
+        if self._repo is not None:
+            try:
+                return bool(self._repo.status())
+            except Exception:
+                pass  # fall through to the subprocess path
+
+        branch, dirty = self._git_status()
+        self._branch_cache = branch  # same exec answered both
+        return dirty
     
     def create_branch(self, branch_name: str) -> bool:
         """
@@ -57,6 +127,14 @@ class GitOperations:
         
         If there are uncommitted changes, stash them first.
         """
+        if self._repo is not None:
+            try:
+                if self._create_branch_pygit2(branch_name):
+                    self._branch_cache = branch_name
+                    return True
+            except Exception:
+                pass  # fall through to the subprocess path
+
         # Check for uncommitted changes
         had_changes = self.has_uncommitted_changes()
         
@@ -74,7 +152,9 @@ class GitOperations:
         if had_changes and success:
             # Restore stashed changes
             self._run_git("stash", "pop")
-        
+
+        if success:
+            self._branch_cache = branch_name
         return success
     
     def commit_all(self, message: str) -> Optional[str]:
@@ -83,24 +163,69 @@ class GitOperations:
         
         Returns the commit hash if successful, None otherwise.
         """
-        # Stage all changes
+        if self._repo is not None:
+            try:
+                return self._commit_all_pygit2(message)
+            except Exception:
+                pass  # fall through to the subprocess path
+
+        # Stage all changes (`commit -a` would miss untracked files)
         success, _ = self._run_git("add", "-A")
         if not success:
             return None
-        
-        # Check if there's anything to commit
-        if not self.has_uncommitted_changes():
-            return None
-        
-        # Commit
+
+        # No pre-check: git itself fails with "nothing to commit" when
+        # the index is clean, so the status exec would be redundant
         success, output = self._run_git("commit", "-m", message)
         if not success:
             return None
-        
-        # Get commit hash
+
+        # The summary line already carries the abbreviated hash, so the
+        # rev-parse exec is only needed if the output ever changes shape
+        match = _COMMIT_LINE_RE.match(output)
+        if match:
+            return match.group(1)
+
         success, commit_hash = self._run_git("rev-parse", "HEAD")
         return commit_hash if success else None
     
+    def _create_branch_pygit2(self, branch_name: str) -> bool:
+        """
+        Create and checkout a branch via libgit2.
+
+        The branch points at HEAD, so switching keeps the worktree
+        untouched — no stash round-trip needed.
+        """
+        commit = self._repo[self._repo.head.target]
+
+        branch = self._repo.branches.local.get(branch_name)
+        if branch is None:
+            branch = self._repo.branches.local.create(branch_name, commit)
+
+        self._repo.checkout(branch, strategy=pygit2.GIT_CHECKOUT_SAFE)
+        self._repo.set_head(branch.name)
+        return True
+
+    def _commit_all_pygit2(self, message: str) -> Optional[str]:
+        """Stage everything and commit via libgit2. Returns the hash."""
+        index = self._repo.index
+        index.add_all()
+        index.write()
+
+        # Nothing staged and nothing dirty -> nothing to commit
+        if not self._repo.status():
+            return None
+
+        tree = index.write_tree()
+        try:
+            signature = self._repo.default_signature
+        except Exception:
+            signature = pygit2.Signature("DevAgent", "devagent@localhost")
+
+        parents = [] if self._repo.head_is_unborn else [self._repo.head.target]
+        oid = self._repo.create_commit("HEAD", signature, signature, message, tree, parents)
+        return str(oid)
+
     def get_diff(self, staged: bool = False) -> str:
         """Get the current diff."""
         args = ["diff"]
@@ -112,7 +237,23 @@ class GitOperations:
     
     def checkout_branch(self, branch_name: str) -> bool:
         """Checkout an existing branch."""
+        if self._repo is not None:
+            try:
+                branch = self._repo.branches.local.get(branch_name)
+                if branch is None:
+                    # Not a local branch; git checkout may still resolve
+                    # it (e.g. a remote-tracking branch)
+                    raise LookupError(branch_name)
+                self._repo.checkout(branch, strategy=pygit2.GIT_CHECKOUT_SAFE)
+                self._repo.set_head(branch.name)
+                self._branch_cache = branch_name
+                return True
+            except Exception:
+                pass  # fall through to the subprocess path
+
         success, _ = self._run_git("checkout", branch_name)
+        if success:
+            self._branch_cache = branch_name
         return success
     
     def merge_branch(self, branch_name: str, message: str = None) -> bool:
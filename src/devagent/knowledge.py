@@ -9,32 +9,141 @@ Handles loading and managing knowledge files including:
 - Personas (developer preferences)
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
-import re
 
 
 # Knowledge base is stored alongside the package
 KNOWLEDGE_DIR = Path(__file__).parent.parent.parent / "knowledge"
 
+# Search order for get_rule — also the priority when names collide
+_CATEGORIES = ("rules", "patterns", "personas")
+
+# Tech-stack entry (lowercased) -> rule files it pulls in
+_TECH_TO_RULES = {
+    "typescript": ("typescript",),
+    "javascript": ("javascript",),
+    "nodejs": ("nodejs",),
+    "nextjs": ("nextjs", "react"),
+    "react": ("react",),
+    "python": ("python",),
+    "prisma": ("prisma",),
+    "tailwind": ("tailwind",),
+    "supabase": ("supabase",),
+    "neo4j": ("neo4j",),
+}
+
 
 class KnowledgeBase:
     """
     Manages the knowledge base of rules, patterns, and personas.
+
+    The whole knowledge tree is a handful of small markdown files, so
+    it is scanned and loaded into memory once at construction; every
+    lookup afterwards is a dict hit instead of an exists()/read pair.
     """
-    
+
     def __init__(self, knowledge_dir: Path = None):
         self.knowledge_dir = knowledge_dir or KNOWLEDGE_DIR
-        
+
         # Create directories if they don't exist
-        (self.knowledge_dir / "rules").mkdir(parents=True, exist_ok=True)
-        (self.knowledge_dir / "patterns").mkdir(parents=True, exist_ok=True)
-        (self.knowledge_dir / "personas").mkdir(parents=True, exist_ok=True)
-    
+        for category in _CATEGORIES:
+            (self.knowledge_dir / category).mkdir(parents=True, exist_ok=True)
+
+        # Build the index off-thread so its disk I/O overlaps the rest
+        # of startup (Gemini client init, context detection); lookups
+        # block on _ready until the first build lands.
+        # DEVAGENT_NO_PREWARM forces a synchronous build for tests.
+        self._ready = threading.Event()
+        if os.environ.get("DEVAGENT_NO_PREWARM"):
+            self._build_index()
+        else:
+            threading.Thread(target=self._build_index, daemon=True).start()
+
+    def _dir_stamp(self) -> tuple:
+        """
+        Names and mtime_ns of every .md file per category. Directory
+        mtime alone would miss in-place edits (which don't touch the
+        parent dir), so each file is stat'd — the tree is a handful of
+        files, and scandir hands back cached stat results on Linux.
+        """
+        stamp = []
+        for category in _CATEGORIES:
+            try:
+                with os.scandir(self.knowledge_dir / category) as it:
+                    stamp.append(tuple(sorted(
+                        (entry.name, entry.stat().st_mtime_ns)
+                        for entry in it if entry.name.endswith(".md")
+                    )))
+            except OSError:
+                stamp.append(())
+        return tuple(stamp)
+
+    def _check_stale(self):
+        """Rebuild the index if the knowledge tree changed on disk."""
+        self._ready.wait()
+        stamp = self._dir_stamp()
+        if stamp != self._stamp:
+            self._build_index()
+
+    def _build_index(self):
+        """Scan each category directory once and cache file contents."""
+        self._stamp = self._dir_stamp()
+        self._content: dict[str, dict[str, str]] = {}
+        self._by_name: dict[str, str] = {}
+
+        per_category: dict[str, list[str]] = {}
+        for category in _CATEGORIES:
+            try:
+                with os.scandir(self.knowledge_dir / category) as it:
+                    per_category[category] = sorted(
+                        entry.path for entry in it
+                        if entry.name.endswith(".md") and entry.is_file()
+                    )
+            except OSError:
+                per_category[category] = []
+
+        def read(path: str):
+            try:
+                # One read syscall + one C-level decode; skips the
+                # TextIOWrapper newline/decode state machine
+                return Path(path).read_bytes().decode("utf-8")
+            except OSError:
+                return None
+
+        # The GIL drops during read syscalls, so a small pool overlaps
+        # cold-cache I/O; not worth spinning up for a couple of files
+        all_paths = [p for files in per_category.values() for p in files]
+        if len(all_paths) > 2:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                texts = dict(zip(all_paths, pool.map(read, all_paths)))
+        else:
+            texts = {p: read(p) for p in all_paths}
+
+        for category, files in per_category.items():
+            entries: dict[str, str] = {}
+            for path in files:
+                text = texts.get(path)
+                if text is not None:
+                    entries[os.path.basename(path)[:-3]] = text
+
+            self._content[category] = entries
+            for name, text in entries.items():
+                self._by_name.setdefault(name, text)
+
+        self._ready.set()
+
+    def refresh(self):
+        """Re-scan the knowledge tree (after adding or editing files)."""
+        self._build_index()
+
     def list_rules(self) -> dict[str, list[dict]]:
         """
         List all available rules organized by category.
-        
+
         Returns:
             {
                 "rules": [{"name": "typescript", "description": "..."}],
@@ -42,49 +151,36 @@ class KnowledgeBase:
                 "personas": [...]
             }
         """
-        result = {
-            "rules": [],
-            "patterns": [],
-            "personas": []
-        }
-        
-        for category in result.keys():
-            category_dir = self.knowledge_dir / category
-            if category_dir.exists():
-                for file in category_dir.glob("*.md"):
-                    if file.name.startswith("_"):
-                        continue
-                    
-                    # Try to extract description from first line
-                    description = ""
-                    try:
-                        content = file.read_text(encoding="utf-8")
-                        first_line = content.split("\n")[0]
-                        if first_line.startswith("# "):
-                            description = first_line[2:].strip()
-                    except Exception:
-                        pass
-                    
-                    result[category].append({
-                        "name": file.stem,
-                        "description": description,
-                        "path": str(file)
-                    })
-        
+        self._check_stale()
+        result = {}
+
+        for category in _CATEGORIES:
+            items = []
+            for name, content in self._content.get(category, {}).items():
+                if name.startswith("_"):
+                    continue
+
+                # Try to extract description from first line
+                first_line = content.split("\n", 1)[0]
+                description = first_line[2:].strip() if first_line.startswith("# ") else ""
+
+                items.append({
+                    "name": name,
+                    "description": description,
+                    "path": str(self.knowledge_dir / category / f"{name}.md")
+                })
+            result[category] = items
+
         return result
-    
+
     def get_rule(self, name: str) -> Optional[str]:
         """
         Get the content of a specific rule by name.
-        
+
         Searches in rules/, patterns/, and personas/ directories.
         """
-        for category in ["rules", "patterns", "personas"]:
-            file_path = self.knowledge_dir / category / f"{name}.md"
-            if file_path.exists():
-                return file_path.read_text(encoding="utf-8")
-        
-        return None
+        self._check_stale()
+        return self._by_name.get(name)
     
     def get_rules_for_stack(self, tech_stack: list[str]) -> list[str]:
         """
@@ -92,51 +188,33 @@ class KnowledgeBase:
         
         Always includes the base rules, then adds tech-specific ones.
         """
+        self._check_stale()
         rules = []
-        
+
         # Always include base rules if they exist
-        base_rule = self.get_rule("_base")
+        base_rule = self._by_name.get("_base")
         if base_rule:
             rules.append(base_rule)
-        
-        # Map tech stack items to rule names
-        tech_to_rules = {
-            "typescript": ["typescript"],
-            "javascript": ["javascript"],
-            "nodejs": ["nodejs"],
-            "nextjs": ["nextjs", "react"],
-            "react": ["react"],
-            "python": ["python"],
-            "prisma": ["prisma"],
-            "tailwind": ["tailwind"],
-            "supabase": ["supabase"],
-            "neo4j": ["neo4j"],
-        }
-        
-        # Collect relevant rules
-        added_rules = set()
-        for tech in tech_stack:
-            tech_lower = tech.lower()
-            if tech_lower in tech_to_rules:
-                for rule_name in tech_to_rules[tech_lower]:
-                    if rule_name not in added_rules:
-                        rule_content = self.get_rule(rule_name)
-                        if rule_content:
-                            rules.append(rule_content)
-                            added_rules.add(rule_name)
-        
+
+        # dict.fromkeys dedupes while preserving order
+        wanted = dict.fromkeys(
+            rule_name
+            for tech in tech_stack
+            for rule_name in _TECH_TO_RULES.get(tech.lower(), ())
+        )
+        rules.extend(
+            content for name in wanted
+            if (content := self._by_name.get(name)) is not None
+        )
+
         return rules
     
     def get_persona(self, name: str) -> Optional[str]:
         """Get a persona configuration."""
-        file_path = self.knowledge_dir / "personas" / f"{name}.md"
-        if file_path.exists():
-            return file_path.read_text(encoding="utf-8")
-        return None
-    
+        self._check_stale()
+        return self._content.get("personas", {}).get(name)
+
     def get_pattern(self, name: str) -> Optional[str]:
         """Get a code pattern template."""
-        file_path = self.knowledge_dir / "patterns" / f"{name}.md"
-        if file_path.exists():
-            return file_path.read_text(encoding="utf-8")
-        return None
+        self._check_stale()
+        return self._content.get("patterns", {}).get(name)